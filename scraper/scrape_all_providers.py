@@ -5,16 +5,51 @@ Crawls each provider website to find registration URLs and dates,
 then updates the database with the found information.
 """
 
-import json
+import asyncio
+import logging
 import os
 import sys
-import time
 import argparse
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from queue import SimpleQueue
+from urllib.parse import urlparse
+import hishel
+import httpx
+import orjson
+from dotenv import load_dotenv
 from supabase import create_client, Client
 
 # Import the scraper
-from scrape_program import ProgramScraper
+from scrape_program import HostLimiter, ProgramScraper
+
+logger = logging.getLogger("scraper")
+
+# Number of program updates sent to the database per round trip
+UPDATE_BATCH_SIZE = 500
+# Number of providers fetched from the database per page
+PROVIDER_PAGE_SIZE = 500
+# On-disk HTTP cache location and how long entries are kept for revalidation
+HTTP_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "http"
+HTTP_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Environment variables that must be set before connecting to Supabase
+REQUIRED_ENV_KEYS = ("NEXT_PUBLIC_SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+# Program columns the scraper may fill in when they are still empty
+FIELDS = ("registration_url", "re_enrollment_date", "new_registration_date")
+
+
+def setup_logging() -> QueueListener:
+    """Route scraper logs through a queue so workers never block on stderr writes"""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(SimpleQueue(), handler)
+    logger.addHandler(QueueHandler(listener.queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
 
 
 def get_supabase_client() -> Client:
@@ -28,17 +63,46 @@ def get_supabase_client() -> Client:
     return create_client(url, key)
 
 
-def get_providers_to_scrape(supabase: Client, limit: int = None) -> list:
-    """Get all providers with websites from the database"""
-    query = supabase.table("programs").select(
-        "id, name, provider_name, provider_website, registration_url, re_enrollment_date, new_registration_date"
-    ).not_.is_("provider_website", "null")
+def iter_provider_pages(supabase: Client, limit: int = None, only_missing: bool = False,
+                        page_size: int = PROVIDER_PAGE_SIZE, started_at: str = None):
+    """Yield pages of providers with websites, least recently scraped first, one page per round trip"""
+    started_at = started_at or datetime.now(timezone.utc).isoformat()
+    fetched = 0
+    last = None
+    while limit is None or fetched < limit:
+        size = page_size if limit is None else min(page_size, limit - fetched)
+        query = supabase.table("programs").select(
+            "id, name, provider_name, provider_website, registration_url, re_enrollment_date, new_registration_date, "
+            "last_scraped_at"
+        ).not_.is_("provider_website", "null")
+
+        if only_missing:
+            query = query.or_("registration_url.is.null,re_enrollment_date.is.null,new_registration_date.is.null")
+
+        # Keyset pagination on (last_scraped_at NULLS FIRST, id). Providers checkpointed
+        # during this run are newer than started_at and drop out instead of coming around again.
+        if last is None:
+            query = query.or_(f'last_scraped_at.is.null,last_scraped_at.lt."{started_at}"')
+        elif last["last_scraped_at"] is None:
+            query = query.or_(
+                f'last_scraped_at.lt."{started_at}",and(last_scraped_at.is.null,id.gt.{last["id"]})'
+            )
+        else:
+            query = query.lt("last_scraped_at", started_at).or_(
+                f'last_scraped_at.gt."{last["last_scraped_at"]}",'
+                f'and(last_scraped_at.eq."{last["last_scraped_at"]}",id.gt.{last["id"]})'
+            )
+
+        response = query.order("last_scraped_at", nullsfirst=True).order("id").limit(size).execute()
 
-    if limit:
-        query = query.limit(limit)
+        if not response.data:
+            return
+        yield response.data
 
-    response = query.execute()
-    return response.data
+        if len(response.data) < size:
+            return
+        fetched += len(response.data)
+        last = response.data[-1]
 
 
 def update_program(supabase: Client, program_id: str, updates: dict) -> bool:
@@ -47,12 +111,61 @@ def update_program(supabase: Client, program_id: str, updates: dict) -> bool:
         supabase.table("programs").update(updates).eq("id", program_id).execute()
         return True
     except Exception as e:
-        print(f"Error updating program {program_id}: {e}", file=sys.stderr)
+        logger.error("Error updating program %s: %s", program_id, e)
         return False
 
 
-def scrape_provider(provider: dict, max_pages: int = 10, max_depth: int = 2) -> dict:
-    """Scrape a single provider website"""
+def flush_updates(supabase: Client, rows: list) -> int:
+    """Apply a batch of program updates in one round trip, returning how many programs got new info"""
+    if not rows:
+        return 0
+
+    # Rows that only carry the last_scraped_at checkpoint don't count as updated programs
+    try:
+        supabase.rpc("bulk_update_program_registration", {"updates": rows}).execute()
+        return sum(1 for row in rows if any(k in row for k in FIELDS))
+    except Exception as e:
+        # Fall back to one UPDATE per row so a single bad row doesn't sink the batch
+        logger.warning("Batch update of %s programs failed (%s), retrying row by row", len(rows), e)
+        updated = 0
+        for row in rows:
+            updates = {k: v for k, v in row.items() if k != "id"}
+            if update_program(supabase, row["id"], updates) and any(k in row for k in FIELDS):
+                updated += 1
+        return updated
+
+
+def create_http_client(max_connections: int = 128, cache_dir: Path = None) -> httpx.AsyncClient:
+    """Create one pooled HTTP/2 client shared by every provider scrape"""
+    options = dict(
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=max_connections),
+        timeout=10,
+    )
+    if cache_dir is None:
+        return httpx.AsyncClient(**options)
+
+    # Persistent cache: every reuse is revalidated with If-None-Match / If-Modified-Since,
+    # so unchanged sites cost a 304 while newly posted registration dates are never missed
+    return hishel.AsyncCacheClient(
+        storage=hishel.AsyncFileStorage(base_path=cache_dir, ttl=HTTP_CACHE_TTL_SECONDS),
+        controller=hishel.Controller(always_revalidate=True),
+        **options,
+    )
+
+
+def provider_host(website: str) -> str:
+    """Return the host a provider website is served from"""
+    if not website.startswith("http"):
+        website = f"https://{website}"
+    return urlparse(website).netloc
+
+
+async def scrape_provider(provider: dict, sem: asyncio.Semaphore, host_sems: dict, max_pages: int = 10,
+                          max_depth: int = 2, max_per_host: int = 4, client: httpx.AsyncClient = None,
+                          timeout: float = None, host_limiter: HostLimiter = None) -> dict:
+    """Scrape a single provider website, holding a slot in the global and per-host concurrency pools"""
     website = provider.get("provider_website")
     if not website:
         return None
@@ -61,29 +174,40 @@ def scrape_provider(provider: dict, max_pages: int = 10, max_depth: int = 2) ->
     if not website.startswith("http"):
         website = f"https://{website}"
 
-    print(f"\n{'='*60}", file=sys.stderr)
-    print(f"Scraping: {provider.get('provider_name', 'Unknown')}", file=sys.stderr)
-    print(f"Website: {website}", file=sys.stderr)
-    print(f"{'='*60}", file=sys.stderr)
+    # Many providers share a host (CMS platforms, park districts), so cap how many
+    # of them hold a global slot for the same host at once; their individual
+    # requests are capped and spaced separately by the shared host_limiter
+    host = provider_host(website)
+    if host not in host_sems:
+        host_sems[host] = asyncio.Semaphore(max_per_host)
+
+    async with host_sems[host], sem:
+        logger.info("Scraping: %s (%s)", provider.get('provider_name', 'Unknown'), website)
+
+        try:
+            scraper = ProgramScraper(
+                url=website,
+                max_pages=max_pages,
+                max_depth=max_depth,
+                client=client,
+                host_limiter=host_limiter
+            )
+            # Bound each scrape so one hung host cannot pin a worker (and its slots) indefinitely
+            result = await asyncio.wait_for(scraper.scrape_async(crawl=True), timeout)
+
+            return {
+                "registration_url": result.get("registration_url"),
+                "re_enrollment_date": result.get("re_enrollment_date"),
+                "new_registration_date": result.get("new_registration_date"),
+                "crawled_pages": result.get("crawled_pages", []),
+            }
 
-    try:
-        scraper = ProgramScraper(
-            url=website,
-            max_pages=max_pages,
-            max_depth=max_depth
-        )
-        result = scraper.scrape(crawl=True)
-
-        return {
-            "registration_url": result.get("registration_url"),
-            "re_enrollment_date": result.get("re_enrollment_date"),
-            "new_registration_date": result.get("new_registration_date"),
-            "crawled_pages": result.get("crawled_pages", []),
-        }
-
-    except Exception as e:
-        print(f"Error scraping {website}: {e}", file=sys.stderr)
-        return None
+        except asyncio.TimeoutError:
+            logger.warning("Timed out scraping %s after %.1fs", website, timeout)
+            return None
+        except Exception as e:
+            logger.error("Error scraping %s: %s", website, e)
+            return None
 
 
 def main():
@@ -98,111 +222,236 @@ def main():
                         help='Maximum crawl depth per provider (default: 2)')
     parser.add_argument('--dry-run', action='store_true',
                         help='Do not update database, just show what would be updated')
-    parser.add_argument('--delay', type=float, default=2.0,
-                        help='Delay between providers in seconds (default: 2)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Maximum providers scraped in parallel (default: 4)')
+    parser.add_argument('--max-per-host', type=int, default=4,
+                        help='Maximum providers scraped, and requests sent, in parallel on the same host (default: 4)')
     parser.add_argument('--only-missing', action='store_true',
                         help='Only scrape providers missing registration info')
+    parser.add_argument('--no-http-cache', action='store_true',
+                        help='Disable the on-disk HTTP cache used between runs')
+    parser.add_argument('--output', type=str, default='-',
+                        help='File to stream per-provider results to as JSON lines (default: stdout)')
+    parser.add_argument('--provider-timeout', type=float, default=120,
+                        help='Maximum seconds spent scraping a single provider (default: 120)')
+    parser.add_argument('--max-duration', type=float, default=None,
+                        help='Stop starting new providers after this many seconds; the rest are left for the next run')
 
     args = parser.parse_args()
+    listener = setup_logging()
 
-    # Load environment variables from .env.local if it exists
+    # Load environment variables from .env.local if it exists and the
+    # environment wasn't already provided (e.g. injected by CI or cron)
     env_file = os.path.join(os.path.dirname(__file__), '..', '.env.local')
-    if os.path.exists(env_file):
-        print(f"Loading environment from {env_file}", file=sys.stderr)
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
+    if any(key not in os.environ for key in REQUIRED_ENV_KEYS) and os.path.exists(env_file):
+        logger.info("Loading environment from %s", env_file)
+        load_dotenv(env_file, override=False)
 
     try:
         supabase = get_supabase_client()
     except Exception as e:
-        print(f"Failed to connect to Supabase: {e}", file=sys.stderr)
+        logger.error("Failed to connect to Supabase: %s", e)
+        listener.stop()
         sys.exit(1)
 
-    # Get providers to scrape
-    providers = get_providers_to_scrape(supabase, args.limit)
-    print(f"\nFound {len(providers)} providers with websites", file=sys.stderr)
-
-    # Filter to only missing if requested
-    if args.only_missing:
-        providers = [
-            p for p in providers
-            if not p.get("registration_url") or not p.get("re_enrollment_date") or not p.get("new_registration_date")
-        ]
-        print(f"Filtered to {len(providers)} providers missing registration info", file=sys.stderr)
-
+    # Only counters are kept in memory; per-provider results are streamed to the output
     results = {
-        "total": len(providers),
+        "total": 0,
         "scraped": 0,
         "updated": 0,
         "failed": 0,
-        "providers": []
+        "unfinished": 0,
     }
+    out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+
+    def write_result(provider_result: dict):
+        out.write(orjson.dumps(provider_result, option=orjson.OPT_APPEND_NEWLINE))
+        out.flush()
+
+    # Updates are accumulated and written in batches instead of one UPDATE per provider
+    pending_updates = []
 
-    for i, provider in enumerate(providers):
-        print(f"\nProgress: {i+1}/{len(providers)}", file=sys.stderr)
+    async def flush_pending():
+        batch = pending_updates[:]
+        pending_updates.clear()
+        updated = await asyncio.to_thread(flush_updates, supabase, batch)
+        results["updated"] += updated
+        if batch:
+            logger.info("Checkpointed %s programs in database, %s with new info", len(batch), updated)
 
-        scraped = scrape_provider(
-            provider,
-            max_pages=args.max_pages,
-            max_depth=args.max_depth
-        )
+    async def record(provider: dict, scraped: dict, error: str = "Scraping failed"):
+        done = results["scraped"] + results["failed"] + results["unfinished"] + 1
+        logger.info("Progress: %s/%s queued", done, results['total'])
 
         if scraped:
             results["scraped"] += 1
 
             # Prepare updates (only update if we found new info)
-            updates = {}
-            if scraped.get("registration_url") and not provider.get("registration_url"):
-                updates["registration_url"] = scraped["registration_url"]
-            if scraped.get("re_enrollment_date") and not provider.get("re_enrollment_date"):
-                updates["re_enrollment_date"] = scraped["re_enrollment_date"]
-            if scraped.get("new_registration_date") and not provider.get("new_registration_date"):
-                updates["new_registration_date"] = scraped["new_registration_date"]
+            updates = {k: scraped[k] for k in FIELDS if scraped.get(k) and not provider.get(k)} or None
 
             provider_result = {
                 "id": provider["id"],
                 "name": provider.get("provider_name"),
                 "website": provider.get("provider_website"),
                 "found": scraped,
-                "updates": updates if updates else None
+                "updates": updates
             }
-            results["providers"].append(provider_result)
+            write_result(provider_result)
 
             if updates:
-                if args.dry_run:
-                    print(f"Would update: {json.dumps(updates)}", file=sys.stderr)
-                else:
-                    if update_program(supabase, provider["id"], updates):
-                        results["updated"] += 1
-                        print(f"Updated: {json.dumps(updates)}", file=sys.stderr)
+                logger.info("%s: %s", "Would update" if args.dry_run else "Queued update", updates)
         else:
-            results["failed"] += 1
-            results["providers"].append({
+            updates = None
+            results["unfinished" if error == "deadline" else "failed"] += 1
+            write_result({
                 "id": provider["id"],
                 "name": provider.get("provider_name"),
                 "website": provider.get("provider_website"),
-                "error": "Scraping failed"
+                "error": error
             })
+            # Unfinished providers keep their old checkpoint so the next run starts with them
+            if error == "deadline":
+                return
+
+        # Every visited provider is checkpointed, found info or not, so the next
+        # run moves on to the least recently scraped ones
+        if not args.dry_run:
+            pending_updates.append({
+                "id": provider["id"],
+                **(updates or {}),
+                "last_scraped_at": datetime.now(timezone.utc).isoformat(),
+            })
+            if len(pending_updates) >= UPDATE_BATCH_SIZE:
+                await flush_pending()
+
+    async def produce(queue: asyncio.Queue, num_workers: int, pages, page: list, deadline: float):
+        # Stream providers page by page so scraping starts as soon as the first page arrives
+        while page:
+            results["total"] += len(page)
+            logger.info("Queued %s providers (%s total)", len(page), results['total'])
+            for provider in page:
+                await queue.put(provider)
+            if time.monotonic() >= deadline:
+                logger.warning("Run deadline reached, not fetching more providers")
+                break
+            page = await asyncio.to_thread(next, pages, None)
+
+        for _ in range(num_workers):
+            await queue.put(None)
+
+    async def work(queue: asyncio.Queue, out_queue: asyncio.Queue, sem: asyncio.Semaphore, host_sems: dict,
+                   host_limiter: HostLimiter, client: httpx.AsyncClient, deadline: float):
+        while True:
+            provider = await queue.get()
+            if provider is None:
+                return
+
+            # Past the run deadline, drain the queue without scraping so the run ends on time
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await out_queue.put((provider, None, "deadline"))
+                continue
+
+            scraped = await scrape_provider(
+                provider,
+                sem,
+                host_sems,
+                max_pages=args.max_pages,
+                max_depth=args.max_depth,
+                max_per_host=max(1, args.max_per_host),
+                client=client,
+                timeout=min(args.provider_timeout, remaining),
+                host_limiter=host_limiter
+            )
+            if scraped is None and time.monotonic() >= deadline:
+                await out_queue.put((provider, None, "deadline"))
+            else:
+                await out_queue.put((provider, scraped))
+
+    async def write(out_queue: asyncio.Queue):
+        # Single writer stage: results and database batches are handled in order
+        # of completion while the workers keep scraping
+        try:
+            while True:
+                item = await out_queue.get()
+                if item is None:
+                    break
+                await record(*item)
+        finally:
+            await flush_pending()
+
+    async def run():
+        deadline = time.monotonic() + args.max_duration if args.max_duration else float("inf")
+        pages = iter_provider_pages(supabase, args.limit, only_missing=args.only_missing)
+        first_page = await asyncio.to_thread(next, pages, None)
+
+        # Providers are I/O bound, so scrape them concurrently; the semaphore
+        # bounds how many browser sessions are open at once. Slots beyond what the
+        # per-host caps allow for the hosts actually present would only sit blocked,
+        # so size the pool from the distinct hosts in the first page.
+        max_per_host = max(1, args.max_per_host)
+        hosts = {provider_host(p["provider_website"]) for p in first_page or [] if p.get("provider_website")}
+        concurrency = max(1, min(args.concurrency, max_per_host * len(hosts)))
+        if hosts and max_per_host * len(hosts) < args.concurrency:
+            logger.warning("Only %s distinct hosts to scrape, running %s providers at a time (host-bound)",
+                           len(hosts), concurrency)
+        # Extra workers keep the pool busy while some wait on a per-host slot
+        num_workers = 2 * concurrency
+        sem = asyncio.Semaphore(concurrency)
+        host_sems = {}  # netloc -> asyncio.Semaphore
+        # Each provider crawls several pages at once, so the per-host request cap and
+        # spacing are enforced across all providers rather than per scraper
+        host_limiter = HostLimiter(max_per_host)
+        # Bounded queues keep memory proportional to concurrency rather than to the
+        # provider count: the producer and workers block once the next stage falls behind
+        queue = asyncio.Queue(maxsize=num_workers)
+        out_queue = asyncio.Queue(maxsize=num_workers)
+        writer = asyncio.create_task(write(out_queue))
+        # One pooled HTTP/2 client for the whole run so connections are reused across providers
+        cache_dir = None if args.no_http_cache else HTTP_CACHE_DIR
+        async with create_http_client(cache_dir=cache_dir) as client:
+            stages = [
+                asyncio.create_task(produce(queue, num_workers, pages, first_page, deadline)),
+                *[asyncio.create_task(work(queue, out_queue, sem, host_sems, host_limiter, client, deadline))
+                  for _ in range(num_workers)],
+            ]
+            stages_done = asyncio.gather(*stages)
+            try:
+                # The writer is watched alongside the stages: it only finishes early by
+                # failing, and workers would otherwise block forever on the full out_queue
+                await asyncio.wait([stages_done, writer], return_when=asyncio.FIRST_COMPLETED)
+                if writer.done():
+                    writer.result()
+                stages_done.result()
+            finally:
+                # If a stage failed, stop the rest and still let the writer drain and
+                # flush its buffered updates before the error propagates
+                for task in stages:
+                    task.cancel()
+                await asyncio.gather(*stages, return_exceptions=True)
+                if not writer.done():
+                    await out_queue.put(None)
+                await writer
 
-        # Delay between providers to be respectful
-        if i < len(providers) - 1:
-            time.sleep(args.delay)
-
-    # Print summary
-    print(f"\n{'='*60}", file=sys.stderr)
-    print("SUMMARY", file=sys.stderr)
-    print(f"{'='*60}", file=sys.stderr)
-    print(f"Total providers: {results['total']}", file=sys.stderr)
-    print(f"Successfully scraped: {results['scraped']}", file=sys.stderr)
-    print(f"Database updated: {results['updated']}", file=sys.stderr)
-    print(f"Failed: {results['failed']}", file=sys.stderr)
-
-    # Output full results as JSON
-    print(json.dumps(results, indent=2))
+    try:
+        asyncio.run(run())
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+        # Print summary
+        logger.info("=" * 60)
+        logger.info("SUMMARY")
+        logger.info("=" * 60)
+        logger.info("Total providers: %s", results['total'])
+        logger.info("Successfully scraped: %s", results['scraped'])
+        logger.info("Database updated: %s", results['updated'])
+        logger.info("Failed: %s", results['failed'])
+        logger.info("Unfinished (deadline): %s", results['unfinished'])
+        listener.stop()
+
+    # Output the summary counters as the final JSON line
+    sys.stdout.buffer.write(orjson.dumps({"summary": results}, option=orjson.OPT_APPEND_NEWLINE))
 
 
 if __name__ == "__main__":
@@ -5,27 +5,509 @@ Extracts enrichment program information from provider websites
 Supports full site crawling to find registration URLs and dates
 """
 
+import asyncio
 import json
+import logging
 import re
 import sys
 import time
 import random
+from contextlib import asynccontextmanager
+from itertools import chain
+import httpx
+import orjson
 from urllib.parse import urlparse, urljoin
 from urllib.robotparser import RobotFileParser
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeout
 from bs4 import BeautifulSoup
-from collections import deque
+from bs4.element import CData, NavigableString
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+logger = logging.getLogger("scraper.program")
+
+# Retry policy for throttled (429) and server error (5xx) responses
+MAX_FETCH_RETRIES = 3
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+# Navigation error codes (Chromium net::ERR_*, Firefox NS_ERROR_*) worth retrying:
+# dropped connections, DNS hiccups and timeouts rather than bad URLs
+TRANSIENT_NAVIGATION_ERRORS = (
+    "net::ERR_CONNECTION", "net::ERR_NAME_NOT_RESOLVED", "net::ERR_TIMED_OUT", "net::ERR_NETWORK_CHANGED",
+    "NS_ERROR_NET_RESET", "NS_ERROR_NET_INTERRUPT", "NS_ERROR_NET_TIMEOUT", "NS_ERROR_CONNECTION_REFUSED",
+    "NS_ERROR_UNKNOWN_HOST",
+)
+
+# Maximum pages fetched concurrently within one site crawl
+MAX_PARALLEL_PAGES = 4
+# Maximum requests in flight against the same host, across every scraper sharing a HostLimiter
+MAX_REQUESTS_PER_HOST = 4
+# Minimum spacing between request starts against the same host
+MIN_HOST_DELAY_SECONDS = 0.25
+# How long a fetched robots.txt is reused for other scrapers of the same host
+ROBOTS_CACHE_TTL_SECONDS = 3600
+
+# Browser identity used for both rendered and plain HTTP fetches
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Browser contexts are replaced after this many pages to bound browser memory growth
+CONTEXT_ROTATION_PAGES = 100
+# Subresources never read by the extractors, aborted before they are downloaded
+BLOCKED_RESOURCE_TYPES = frozenset(("image", "media", "font", "stylesheet"))
+# Analytics and ad hosts (and their subdomains) that only keep the network busy
+BLOCKED_TRACKER_DOMAINS = frozenset((
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "googleadservices.com", "facebook.net", "hotjar.com", "segment.io",
+    "segment.com", "mixpanel.com", "clarity.ms", "adservice.google.com", "newrelic.com", "nr-data.net",
+    "fullstory.com", "intercom.io", "tiktok.com", "snap.licdn.com", "bat.bing.com",
+))
+# How long to wait for the network to settle after DOMContentLoaded; with
+# subresources blocked this is mostly late XHR-rendered content
+NETWORK_IDLE_TIMEOUT_MS = 2000
+
+# Pages fetched over plain HTTP are only trusted when they look server-rendered;
+# anything smaller or shaped like a client-side app shell goes through the browser
+STATIC_MIN_HTML_CHARS = 2000
+STATIC_MIN_TEXT_CHARS = 200
+_BODY_TAG_RE = re.compile(r'<body[\s>]', re.IGNORECASE)
+_APP_SHELL_RE = re.compile(
+    r'<div id=["\'](?:root|app|__next|__nuxt)["\']>\s*</div>|enable javascript to run this app',
+    re.IGNORECASE,
+)
+
+# Month names for parsing registration dates
+_MONTHS = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+}
+
+# Registration dates in one pattern; the named groups tell the three formats apart:
+# "January 15th, 2025" / "Jan 15" (year optional), "01/15/2025" and "2025-01-15".
+# Always matched against lowercased page text, so month names need no case folding;
+# each abbreviation is a shared prefix of its full name, so one branch covers both.
+_DATE_RE = re.compile(
+    r'(?P<month_name>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+    r'\s+(?P<name_day>\d{1,2})(?:st|nd|rd|th)?(?:,?\s*(?P<name_year>\d{4}))?'
+    r'|(?P<us_month>\d{1,2})/(?P<us_day>\d{1,2})/(?P<us_year>\d{4})'
+    r'|(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})'
+)
+
+# Cheap superset of _DATE_RE: one pass over a page tells us whether any
+# date-like token exists before running the per-keyword pattern loops
+_DATE_PREFILTER = re.compile(
+    r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*,?\s+\d|\d/\d|\d{4}-\d'
+)
+
+# Phrases that introduce a registration date. Each list is matched as one
+# alternation so a page is scanned once per list rather than once per phrase.
+# Re-enrollment (current students)
+_RE_ENROLLMENT_KEYWORDS = (
+    're-enrollment', 'reenrollment', 're enrollment',
+    'current students', 'returning students', 'current families',
+    'priority registration', 'early registration',
+)
+# New registration (new students), as found on any crawled page
+_NEW_REGISTRATION_KEYWORDS = (
+    'open enrollment', 'new enrollment', 'new students', 'new families',
+    'general registration', 'public registration', 'returning students begins',
+    'registration opens', 'registration begins', 'enrollment opens',
+    'enrollment begins', 'sign up', 'register by', 'enroll by',
+)
+# New registration on the registration page itself, where looser phrasing is trusted
+_REGISTRATION_PAGE_NEW_KEYWORDS = (
+    'open enrollment', 'new enrollment', 'new students', 'new families',
+    'general registration', 'public registration',
+    'registration opens', 'registration begins', 'enrollment opens',
+    'enrollment begins', 'sign up', 'register by', 'enroll by',
+    'deadline', 'opens on', 'begins on', 'starts on',
+)
+# Last resort on the registration page: any registration-related word
+_GENERAL_REGISTRATION_KEYWORDS = ('registration', 'enrollment', 'deadline', 'opens', 'begins', 'start')
+_RE_ENROLLMENT_RE = re.compile("|".join(map(re.escape, _RE_ENROLLMENT_KEYWORDS)))
+_NEW_REGISTRATION_RE = re.compile("|".join(map(re.escape, _NEW_REGISTRATION_KEYWORDS)))
+# Both crawled-page lists in one pass, tagged by the date field they fill. The groups
+# are lookaheads so a phrase from one list can't swallow an overlapping phrase from
+# the other ("early registration opens"); the leading lookahead keeps the optional
+# groups from matching empty at every position.
+_REGISTRATION_DATE_KEYWORD_RE = re.compile(
+    f'(?={_RE_ENROLLMENT_RE.pattern}|{_NEW_REGISTRATION_RE.pattern})'
+    f'(?=(?P<re_enrollment_date>{_RE_ENROLLMENT_RE.pattern}))?'
+    f'(?=(?P<new_registration_date>{_NEW_REGISTRATION_RE.pattern}))?'
+)
+_REGISTRATION_PAGE_NEW_RE = re.compile("|".join(map(re.escape, _REGISTRATION_PAGE_NEW_KEYWORDS)))
+_GENERAL_REGISTRATION_RE = re.compile("|".join(map(re.escape, _GENERAL_REGISTRATION_KEYWORDS)))
+
+
+def _parse_date_from_context(text: str, pos: int, endpos: int, today: datetime):
+    """Parse the first future date from text[pos:endpos], return datetime or None"""
+    current_year = today.year
+    # Dates are tried in the order they appear; the first future one wins.
+    # pos/endpos bound the search without slicing out a copy of the context.
+    for match in _DATE_RE.finditer(text, pos, endpos):
+        try:
+            if match['month_name']:
+                month = _MONTHS[match['month_name']]
+                day = int(match['name_day'])
+                if match['name_year']:
+                    year = int(match['name_year'])
+                else:
+                    # Month DD format (assume current or next year)
+                    test_date = datetime(current_year, month, day)
+                    year = current_year if test_date >= today else current_year + 1
+            elif match['us_year']:
+                # MM/DD/YYYY format
+                month, day, year = int(match['us_month']), int(match['us_day']), int(match['us_year'])
+            else:
+                # YYYY-MM-DD format
+                year, month, day = int(match['iso_year']), int(match['iso_month']), int(match['iso_day'])
+
+            parsed_date = datetime(year, month, day)
+        except ValueError:
+            continue
+
+        # Only consider future dates
+        if parsed_date >= today:
+            return parsed_date
+
+    return None
+
+
+# Links to files rather than pages, including ones with a query string or fragment
+_SKIP_EXT_RE = re.compile(r'\.(?:pdf|jpe?g|png|gif|svg|css|js|zip|docx?|xlsx?|mp[34]|avi)(?:$|[?#])', re.IGNORECASE)
+
+# Title suffixes stripped from page titles when used as the program name
+_TITLE_SUFFIX_RE = re.compile(r'\s*[\|\-]\s*(Home|Welcome|About).*$', re.IGNORECASE)
+
+# Boilerplate removed from descriptions (case insensitive)
+_BOILERPLATE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Cookie consent
+    r'by using this (website|site),?\s+you agree to\s+.*?cookies.*?\.?',
+    r'we use cookies\s+.*?\.?',
+    r'this (website|site) uses cookies\s+.*?\.?',
+    r'cookies?\s+help us\s+.*?\.?',
+    r'accept\s+(all\s+)?cookies?',
+    r'cookie\s+(policy|preferences|settings|consent)',
+    # Privacy/Terms
+    r'by (using|continuing|browsing)\s+.*?(agree|accept|consent)\s+.*?(terms|privacy|policy).*?\.?',
+    r'read our privacy policy',
+    r'view our terms',
+    # Generic website notices
+    r'javascript (is|must be) enabled',
+    r'please enable javascript',
+    r'your browser.*?not supported',
+    r'subscribe to our newsletter',
+    r'sign up for (our )?(newsletter|updates|emails)',
+    r'enter your email',
+    # Navigation/UI text
+    r'skip to (main )?content',
+    r'toggle navigation',
+    r'menu',
+    r'search\s*$',
+)]
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Class names of elements likely to hold an about/description section
+_ABOUT_CLASS_RES = [re.compile(keyword, re.IGNORECASE)
+                    for keyword in ("about", "description", "overview", "our program", "what we offer")]
+
+# Contact details
+_CONTACT_RE = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<phone>\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+)
+# Addresses that are never a real point of contact
+_NON_CONTACT_EMAIL_MARKERS = ('noreply', 'example', 'test')
+
+# Street addresses: full address with city, state and zip, or just number + street + suffix
+_FULL_ADDR_RE = re.compile(r'\d+\s+[A-Za-z\s\.]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way|Court|Ct|Circle|Cir|Place|Pl|Terrace|Ter|Parkway|Pkwy)[.,]?\s*(?:#\s*\w+|Suite\s*\w+|Ste\s*\w+|Unit\s*\w+)?[.,]?\s*[A-Za-z\s]+,?\s*[A-Z]{2}\s*\d{5}')
+_STREET_ONLY_RE = re.compile(r'\d+\s+[A-Za-z\s\.]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way|Court|Ct)')
+
+# Operating hours (e.g., "Mon-Fri 9am-5pm")
+_HOURS_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:hours?|open)[:\s]+([^\n]{10,80})',
+    r'((?:monday|mon)[-\s]*(?:friday|fri)[,\s]*\d+\s*(?:am|pm)[^\n]{0,40})',
+    r'((?:mon|tue|wed|thu|fri|sat|sun)[-\s/]+(?:mon|tue|wed|thu|fri|sat|sun)[,\s]+\d+[:\s]*\d*\s*(?:am|pm)[^\n]{0,40})',
+)]
+_DAY_NAMES = {
+    'monday': 'monday', 'mon': 'monday',
+    'tuesday': 'tuesday', 'tue': 'tuesday', 'tues': 'tuesday',
+    'wednesday': 'wednesday', 'wed': 'wednesday',
+    'thursday': 'thursday', 'thu': 'thursday', 'thurs': 'thursday',
+    'friday': 'friday', 'fri': 'friday',
+    'saturday': 'saturday', 'sat': 'saturday',
+    'sunday': 'sunday', 'sun': 'sunday',
+}
+_DAY_RES = [(re.compile(r'\b' + abbr + r'\b'), full_day) for abbr, full_day in _DAY_NAMES.items()]
+# Time range (e.g., "9am-5pm" or "09:00-17:00")
+_TIME_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*[-to–]+\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?', re.IGNORECASE)
+
+# Pricing: free programs, "$100-$200" / "$100 to $200" ranges, and single amounts
+_FREE_RE = re.compile(r'\bfree\b', re.IGNORECASE)
+_PRICE_RANGE_RE = re.compile(r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*[-to–]+\s*\$?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:per|/|each)?\s*(month|session|class|week|term|semester|year)?', re.IGNORECASE)
+_PRICE_RE = re.compile(r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:per|/|each)?\s*(month|session|class|week|term|semester|year)?', re.IGNORECASE)
+
+# Program categories and the keywords that suggest them, in priority order
+_CATEGORY_KEYWORDS = {
+    "swimming": ["swim", "aquatic", "water", "pool"],
+    "art": ["art", "painting", "drawing", "sculpture", "creative"],
+    "chess": ["chess"],
+    "soccer": ["soccer", "football"],
+    "music": ["music", "piano", "guitar", "violin", "instrument"],
+    "dance": ["dance", "ballet", "hip hop"],
+    "martial-arts": ["martial arts", "karate", "taekwondo", "judo", "kung fu"],
+    "technology": ["coding", "programming", "computer", "robotics", "tech"],
+    "academic": ["tutoring", "math", "science", "reading", "academic"],
+    "science": ["science", "stem", "engineering", "physics", "chemistry"],
+    "sports": ["sports", "athletic", "fitness"],
+}
+_KEYWORD_CATEGORIES = {}
+for _category, _keywords in _CATEGORY_KEYWORDS.items():
+    for _keyword in _keywords:
+        _KEYWORD_CATEGORIES.setdefault(_keyword, []).append(_category)
+# All category keywords in one scan; the lookahead reports overlapping hits
+# such as "art" inside "martial arts"
+_CATEGORY_RE = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in _KEYWORD_CATEGORIES) + "))"
+)
+
+# URL or link text words that point at registration or schedule pages
+_REGISTRATION_LINK_RE = re.compile(
+    r'register|registration|enroll|enrollment|sign-up|signup|'
+    r'classes|schedule|programs|sessions|calendar|book|booking',
+    re.IGNORECASE,
+)
+# URL or link text words that point at the sign-up form itself
+_SIGNUP_LINK_RE = re.compile(r'register|enroll|sign-up|signup|sign up', re.IGNORECASE)
+
+# Common SF neighborhoods and their street patterns, in priority order
+_NEIGHBORHOOD_KEYWORDS = {
+    "Marina District": ["marina", "chestnut", "lombard"],
+    "Mission District": ["mission", "valencia", "24th", "16th"],
+    "SOMA": ["townsend", "folsom", "howard", "2nd", "3rd"],
+    "Richmond District": ["geary", "clement"],
+    "Sunset District": ["judah", "noriega", "taraval"],
+    "Noe Valley": ["24th", "castro", "noe"],
+    "Castro": ["castro", "market", "18th"],
+    "Pacific Heights": ["pacific", "broadway", "fillmore"],
+    "Haight-Ashbury": ["haight", "ashbury"],
+    "North Beach": ["columbus", "broadway", "grant"],
+}
+# Street keyword -> (priority, neighborhood) of the first neighborhood listing it
+_KEYWORD_NEIGHBORHOOD = {}
+for _rank, (_neighborhood, _keywords) in enumerate(_NEIGHBORHOOD_KEYWORDS.items()):
+    for _keyword in _keywords:
+        _KEYWORD_NEIGHBORHOOD.setdefault(_keyword, (_rank, _neighborhood))
+_NEIGHBORHOOD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in _KEYWORD_NEIGHBORHOOD) + "))",
+    re.IGNORECASE,
+)
+
+# Elements whose content is never page text, removed from the tree right after
+# parsing wherever they are nested; scripts go too unless they hold JSON-LD
+_NON_TEXT_TAGS = frozenset(('style', 'svg', 'noscript', 'template', 'iframe'))
+
+
+def _is_non_text_tag(tag) -> bool:
+    """find_all filter: styles, SVGs, noscript fallbacks and non-JSON-LD scripts"""
+    if tag.name == 'script':
+        return tag.get('type') != 'application/ld+json'
+    return tag.name in _NON_TEXT_TAGS
+
+
+# JSON-LD types describing the page or site itself rather than the program
+_JSONLD_PAGE_TYPES = frozenset((
+    "WebSite", "WebPage", "AboutPage", "ContactPage", "CollectionPage", "FAQPage",
+    "BreadcrumbList", "ListItem", "SiteNavigationElement", "SearchAction", "ImageObject",
+    "Article", "BlogPosting", "Person",
+))
+# Head elements that don't contribute to the visible body text
+_HEAD_TAGS = frozenset(('head', 'title', 'meta', 'script'))
+# Elements rendered on their own line; everything else flows inline, as in innerText
+_BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'caption', 'dd', 'details', 'dialog',
+    'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'legend', 'li', 'main', 'nav', 'ol', 'option',
+    'p', 'pre', 'section', 'summary', 'table', 'td', 'th', 'tr', 'ul',
+))
+# String types that are page text; comments, scripts and doctypes are left out
+_TEXT_STRING_TYPES = (NavigableString, CData)
+# Source whitespace collapses to one space; block boundaries are marked with NUL
+# (which HTML parsers never pass through) and become one newline each
+_BLOCK_BREAK = '\0'
+_WHITESPACE_RUN_RE = re.compile(r'\s+')
+_BLOCK_BREAK_RE = re.compile(r'[ \0]*\0[ \0]*')
+
+
+def _collect_text(nodes, parts: list):
+    """Append the nodes' strings to parts, with a break around each block-level element"""
+    for node in nodes:
+        if type(node) in _TEXT_STRING_TYPES:
+            parts.append(node)
+        elif node.name in _BLOCK_TAGS:
+            parts.append(_BLOCK_BREAK)
+            _collect_text(node.children, parts)
+            parts.append(_BLOCK_BREAK)
+        elif node.name is not None and node.name not in _HEAD_TAGS:
+            _collect_text(node.children, parts)
+
+
+def _visible_text(soup: BeautifulSoup) -> str:
+    """Body text with blocks on separate lines and whitespace collapsed, like innerText"""
+    parts = []
+    _collect_text(soup.children, parts)
+    text = _WHITESPACE_RUN_RE.sub(' ', ''.join(parts))
+    return _BLOCK_BREAK_RE.sub('\n', text).strip()
+
+
+def _is_tracker(url: str) -> bool:
+    """Whether a request goes to a known analytics/ad host"""
+    host = urlparse(url).hostname or ""
+    while host:
+        if host in BLOCKED_TRACKER_DOMAINS:
+            return True
+        _, _, host = host.partition(".")
+    return False
+
+
+async def _block_unneeded_requests(route):
+    """Route handler: abort media, fonts, styles and trackers, let everything else through"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class HostLimiter:
+    """Per-host request cap and start spacing, shared by every scraper in a batch run"""
+
+    def __init__(self, max_concurrent: int = MAX_REQUESTS_PER_HOST, min_delay: float = MIN_HOST_DELAY_SECONDS):
+        self.max_concurrent = max_concurrent
+        self.min_delay = min_delay
+        self._sems = {}  # host -> asyncio.Semaphore bounding its in-flight requests
+        self._next_start = {}  # host -> monotonic time its next request may start
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the host's request slots, sleeping only when a request started too recently"""
+        host = urlparse(url).netloc
+        sem = self._sems.get(host)
+        if sem is None:
+            sem = self._sems[host] = asyncio.Semaphore(self.max_concurrent)
+        async with sem:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class PagePool:
+    """Playwright pages shared by a site crawl's workers, reused across URLs"""
+
+    def __init__(self, size: int = MAX_PARALLEL_PAGES, rotate_after: int = CONTEXT_ROTATION_PAGES):
+        self.rotate_after = rotate_after
+        self._slots = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle = []  # Pages of the current context ready for reuse
+        self._checked_out = {}  # context -> pages currently in use
+        self._served = 0
+
+    async def _current_context(self):
+        """Return the active context, launching the browser on first use"""
+        if self._browser is None:
+            # Launch browser in headless mode (using Firefox for better macOS compatibility)
+            logger.info("Launching browser...")
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.firefox.launch(headless=True)
+        if self._context is None:
+            # Create context with realistic user agent
+            logger.info("Creating browser context...")
+            self._context = await self._browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={"width": 1920, "height": 1080}
+            )
+            await self._context.route("**/*", _block_unneeded_requests)
+            self._checked_out[self._context] = 0
+        return self._context
+
+    @asynccontextmanager
+    async def page(self):
+        """Check a page out of the pool for the duration of the block"""
+        async with self._slots:
+            async with self._lock:
+                context = await self._current_context()
+                page = self._idle.pop() if self._idle else await context.new_page()
+                self._checked_out[context] += 1
+            try:
+                yield page
+            finally:
+                await self._release(context, page)
+
+    async def _release(self, context, page):
+        """Return a page to the pool, retiring its context once it has served enough pages"""
+        self._checked_out[context] -= 1
+        if context is self._context:
+            self._served += 1
+            if self._served < self.rotate_after:
+                self._idle.append(page)
+                return
+            # Later checkouts get a fresh context; this one closes once its pages are back
+            self._served = 0
+            self._context = None
+            idle, self._idle = self._idle, []
+            for idle_page in idle:
+                await idle_page.close()
+
+        await page.close()
+        if self._checked_out[context] == 0:
+            del self._checked_out[context]
+            await context.close()
+
+    async def close(self):
+        """Close every context and the browser, if one was launched"""
+        if self._browser is None:
+            return
+        logger.info("Closing browser...")
+        for context in list(self._checked_out):
+            await context.close()
+        self._checked_out.clear()
+        self._idle.clear()
+        await self._browser.close()
+        await self._playwright.stop()
 
 
 class ProgramScraper:
-    def __init__(self, url: str, max_pages: int = 10, max_depth: int = 2, region_city: str = "San Francisco"):
+    # Parsed robots.txt per host as (fetched_at, RobotFileParser), shared by all scrapers
+    _robots_cache = {}
+
+    def __init__(self, url: str, max_pages: int = 10, max_depth: int = 2, region_city: str = "San Francisco",
+                 client=None, host_limiter: HostLimiter = None):
         self.url = url
-        self.domain = urlparse(url).netloc
-        self.base_url = f"{urlparse(url).scheme}://{self.domain}"
+        self.client = client  # Optional shared httpx.AsyncClient for plain HTTP fetches
+        # Batch runs pass one limiter so providers on the same host share its request cap
+        self.host_limiter = host_limiter or HostLimiter()
+        parsed = urlparse(url)
+        self.domain = parsed.netloc
+        self.base_url = f"{parsed.scheme}://{self.domain}"
         self.max_pages = max_pages  # Maximum number of pages to crawl
         self.max_depth = max_depth  # Maximum crawl depth from starting page
         self.region_city = region_city  # City name for address matching
+        # Street address with the region's city/state (no zip), built once per scraper
+        self._city_addr_re = re.compile(
+            r'\d+\s+[A-Za-z\s\.]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way|Court|Ct|Circle|Cir|Place|Pl)[.,]?\s*(?:'
+            + re.escape(region_city)
+            + r')[.,]?\s*(?:CA|California|NY|New York|TX|Texas|IL|Illinois|WA|Washington)?',
+            re.IGNORECASE,
+        )
         self.visited_urls = set()
+        self._seen_text_hashes = set()  # hash(text) of every page already run through the extractors
         self.pages_crawled = 0
         self.data = {
             "name": "",
@@ -47,35 +529,103 @@ class ProgramScraper:
             "crawled_pages": []  # Track which pages were crawled
         }
 
-    def check_robots_txt(self) -> bool:
+    async def check_robots_txt(self) -> bool:
         """Check if scraping is allowed by robots.txt"""
+        cached = self._robots_cache.get(self.domain)
+        if cached and time.monotonic() - cached[0] < ROBOTS_CACHE_TTL_SECONDS:
+            return cached[1].can_fetch("*", self.url)
+
         try:
             rp = RobotFileParser()
             rp.set_url(f"https://{self.domain}/robots.txt")
-            rp.read()
+            if self.client is None:
+                async with self.host_limiter.slot(rp.url):
+                    await asyncio.to_thread(rp.read)
+            else:
+                # Reuse the shared client's pooled connection instead of urllib
+                async with self.host_limiter.slot(rp.url):
+                    response = await self.client.get(rp.url)
+                if response.status_code in (401, 403):
+                    rp.disallow_all = True
+                elif 400 <= response.status_code < 500:
+                    rp.allow_all = True
+                else:
+                    response.raise_for_status()
+                    rp.parse(response.text.splitlines())
+            self._robots_cache[self.domain] = (time.monotonic(), rp)
             return rp.can_fetch("*", self.url)
         except Exception as e:
-            print(f"Warning: Could not check robots.txt: {e}", file=sys.stderr)
+            logger.warning("Could not check robots.txt: %s", e)
             return True  # Proceed with caution if robots.txt unavailable
 
-    def human_delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
-        """Add human-like random delay"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    def _parse_retry_after(self, value: str):
+        """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
-    def _normalize_url(self, url: str) -> str:
-        """Normalize URL by removing fragments and trailing slashes"""
-        parsed = urlparse(url)
+    def _retry_delay(self, response, attempt: int):
+        """Seconds to wait before retrying a 429/5xx response, or None if it should not be retried"""
+        if response is None:
+            return None
+        status = response.status
+        if status != 429 and not 500 <= status < 600:
+            return None
+        if attempt >= MAX_FETCH_RETRIES:
+            return None
+
+        retry_after = self._parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_MAX_SECONDS)
+
+        return self._backoff_delay(attempt)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def _is_transient_error(self, error: Exception) -> bool:
+        """Whether a navigation error is a network blip worth retrying"""
+        if isinstance(error, PlaywrightTimeout):
+            return True
+        return isinstance(error, PlaywrightError) and any(code in str(error) for code in TRANSIENT_NAVIGATION_ERRORS)
+
+    def _rate_limit_pause(self, response) -> float:
+        """Seconds to pause before the next request when the host reports an exhausted rate limit"""
+        if response is None:
+            return 0.0
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is None or not remaining.strip().isdigit() or int(remaining) > 0:
+            return 0.0
+
+        pause = self._parse_retry_after(response.headers.get("retry-after"))
+        if pause is None:
+            reset = response.headers.get("x-ratelimit-reset", "").strip()
+            if reset.isdigit():
+                # Either seconds until reset or an epoch timestamp
+                reset_value = float(reset)
+                pause = reset_value - time.time() if reset_value > 1e9 else reset_value
+        if pause is None:
+            pause = BACKOFF_BASE_SECONDS
+        return min(max(pause, 0.0), BACKOFF_MAX_SECONDS)
+
+    def _normalize_url(self, parsed) -> str:
+        """Normalize a parsed URL by removing fragments and trailing slashes"""
         # Remove fragment and normalize path
         normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path.rstrip('/')}"
         if parsed.query:
             normalized += f"?{parsed.query}"
         return normalized
 
-    def _is_same_domain(self, url: str) -> bool:
-        """Check if URL belongs to the same domain"""
-        parsed = urlparse(url)
-        return parsed.netloc == self.domain or parsed.netloc == ""
-
     def _is_valid_page_url(self, url: str) -> bool:
         """Check if URL is a valid page to crawl (not a file, mailto, etc.)"""
         if not url:
@@ -86,17 +636,11 @@ class ProgramScraper:
             return False
 
         # Skip common file extensions
-        skip_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.css', '.js',
-                          '.zip', '.doc', '.docx', '.xls', '.xlsx', '.mp3', '.mp4', '.avi']
-        url_lower = url.lower()
-        if any(url_lower.endswith(ext) for ext in skip_extensions):
-            return False
-
-        return True
+        return not _SKIP_EXT_RE.search(url)
 
     def _extract_internal_links(self, soup: BeautifulSoup, current_url: str) -> list:
-        """Extract all internal links from a page"""
-        links = []
+        """Extract all internal links from a page as (normalized_url, link_text) pairs"""
+        links = {}  # normalized URL -> first non-empty anchor text, in page order
 
         for anchor in soup.find_all('a', href=True):
             href = anchor.get('href', '').strip()
@@ -114,47 +658,28 @@ class ProgramScraper:
             else:
                 continue
 
+            # Parse once and derive both the domain check and the normalized form from it
+            parsed = urlparse(full_url)
+
             # Only include same-domain links
-            if self._is_same_domain(full_url):
-                normalized = self._normalize_url(full_url)
-                if normalized not in self.visited_urls:
-                    links.append(normalized)
+            if parsed.netloc and parsed.netloc != self.domain:
+                continue
+            normalized = self._normalize_url(parsed)
+            if normalized not in self.visited_urls and not links.get(normalized):
+                links[normalized] = anchor.get_text().strip()
 
-        return list(set(links))  # Remove duplicates
+        return list(links.items())
 
     def _is_registration_related(self, url: str, link_text: str = "") -> bool:
         """Check if a URL is likely related to registration"""
-        registration_keywords = [
-            'register', 'registration', 'enroll', 'enrollment', 'sign-up', 'signup',
-            'classes', 'schedule', 'programs', 'sessions', 'calendar', 'book', 'booking'
-        ]
-
-        url_lower = url.lower()
-        text_lower = link_text.lower()
-
-        return any(kw in url_lower or kw in text_lower for kw in registration_keywords)
+        return bool(_REGISTRATION_LINK_RE.search(url) or _REGISTRATION_LINK_RE.search(link_text))
 
-    def _prioritize_links(self, links: list, soup: BeautifulSoup) -> list:
+    def _prioritize_links(self, links_with_text: list) -> list:
         """Prioritize registration-related links to crawl first"""
         registration_links = []
         other_links = []
 
-        # Create a map of URLs to their link text
-        link_texts = {}
-        for anchor in soup.find_all('a', href=True):
-            href = anchor.get('href', '').strip()
-            text = anchor.get_text().strip()
-            if href.startswith('/'):
-                full_url = f"{self.base_url}{href}"
-            elif href.startswith('http'):
-                full_url = href
-            else:
-                full_url = urljoin(self.url, href)
-            normalized = self._normalize_url(full_url)
-            link_texts[normalized] = text
-
-        for link in links:
-            link_text = link_texts.get(link, "")
+        for link, link_text in links_with_text:
             if self._is_registration_related(link, link_text):
                 registration_links.append(link)
             else:
@@ -162,7 +687,74 @@ class ProgramScraper:
 
         return registration_links + other_links
 
-    def _crawl_page(self, page, url: str, depth: int = 0) -> tuple:
+    def _parse_page(self, html: str) -> tuple:
+        """Parse HTML once and derive the visible body text from the same tree"""
+        soup = BeautifulSoup(html, 'lxml')
+        # Drop code and fallback markup at any depth before extractors or text see it
+        for tag in soup.find_all(_is_non_text_tag):
+            tag.decompose()
+        return soup, _visible_text(soup)
+
+    async def _fetch_static(self, url: str):
+        """Fetch a page over plain HTTP, returning (soup, text) or None if it needs a browser"""
+        try:
+            async with self.host_limiter.slot(url):
+                response = await self.client.get(url, headers={"User-Agent": USER_AGENT})
+        except httpx.HTTPError as e:
+            logger.info("Static fetch failed for %s (%s), using browser", url, e)
+            return None
+
+        pause = self._rate_limit_pause(response)
+        if pause:
+            logger.warning("Rate limit reached for %s, pausing %.1fs", self.domain, pause)
+            await asyncio.sleep(pause)
+
+        html = response.text
+        if (response.status_code != 200
+                or "html" not in response.headers.get("content-type", "")
+                or len(html) < STATIC_MIN_HTML_CHARS
+                or not _BODY_TAG_RE.search(html)
+                or _APP_SHELL_RE.search(html)):
+            return None
+
+        soup, text = self._parse_page(html)
+        if len(text) < STATIC_MIN_TEXT_CHARS:
+            return None
+        return soup, text
+
+    async def _fetch_with_playwright(self, pool, url: str) -> tuple:
+        """Render a page in the browser and return (soup, text)"""
+        async with pool.page() as page:
+            for attempt in range(MAX_FETCH_RETRIES + 1):
+                try:
+                    async with self.host_limiter.slot(url):
+                        response = await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                except Exception as e:
+                    if attempt >= MAX_FETCH_RETRIES or not self._is_transient_error(e):
+                        raise
+                    delay = self._backoff_delay(attempt)
+                    logger.warning("Transient error loading %s (%s), retrying in %.1fs", url, e, delay)
+                    await asyncio.sleep(delay)
+                    continue
+                delay = self._retry_delay(response, attempt)
+                if delay is None:
+                    break
+                logger.warning("HTTP %s from %s, retrying in %.1fs", response.status, url, delay)
+                await asyncio.sleep(delay)
+
+            pause = self._rate_limit_pause(response)
+            if pause:
+                logger.warning("Rate limit reached for %s, pausing %.1fs", self.domain, pause)
+                await asyncio.sleep(pause)
+
+            try:
+                await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+            except PlaywrightTimeout:
+                pass
+
+            return self._parse_page(await page.content())
+
+    async def _crawl_page(self, pool, url: str, depth: int = 0) -> tuple:
         """Crawl a single page and return its content and discovered links"""
         if url in self.visited_urls:
             return None, None, []
@@ -177,29 +769,24 @@ class ProgramScraper:
         self.pages_crawled += 1
 
         try:
-            print(f"Crawling ({self.pages_crawled}/{self.max_pages}): {url}", file=sys.stderr)
-            page.goto(url, wait_until="domcontentloaded", timeout=15000)
-            self.human_delay(0.5, 1.5)
-
-            try:
-                page.wait_for_load_state("networkidle", timeout=5000)
-            except PlaywrightTimeout:
-                pass
-
-            html = page.content()
-            text = page.inner_text("body")
-            soup = BeautifulSoup(html, 'html.parser')
+            logger.info("Crawling (%s/%s): %s", self.pages_crawled, self.max_pages, url)
+            # Most provider sites are server-rendered, so try a plain HTTP fetch
+            # first and only pay for a browser render when the page needs JS
+            fetched = await self._fetch_static(url)
+            if fetched is None:
+                fetched = await self._fetch_with_playwright(pool, url)
+            soup, text = fetched
 
             # Extract and prioritize links
             links = self._extract_internal_links(soup, url)
-            prioritized_links = self._prioritize_links(links, soup)
+            prioritized_links = self._prioritize_links(links)
 
             self.data["crawled_pages"].append(url)
 
             return soup, text, prioritized_links
 
         except Exception as e:
-            print(f"Error crawling {url}: {e}", file=sys.stderr)
+            logger.error("Error crawling %s: %s", url, e)
             return None, None, []
 
     def scrape(self, crawl: bool = True) -> dict:
@@ -209,97 +796,174 @@ class ProgramScraper:
         Args:
             crawl: If True, crawl the entire site. If False, only scrape the main page.
         """
+        return asyncio.run(self.scrape_async(crawl=crawl))
+
+    async def scrape_async(self, crawl: bool = True) -> dict:
+        """Async version of scrape() for callers that already run an event loop"""
+        if self.client is None:
+            # Standalone runs get their own pooled client for the plain HTTP fast path
+            async with httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+                timeout=10,
+            ) as client:
+                self.client = client
+                try:
+                    return await self.scrape_async(crawl)
+                finally:
+                    self.client = None
+
         # Check robots.txt (but don't fail if check fails)
         try:
-            if not self.check_robots_txt():
-                print(f"Warning: robots.txt disallows scraping {self.url}", file=sys.stderr)
+            if not await self.check_robots_txt():
+                logger.warning("robots.txt disallows scraping %s", self.url)
                 # Continue anyway for educational/testing purposes
         except Exception as e:
-            print(f"Warning: Could not check robots.txt: {e}", file=sys.stderr)
+            logger.warning("Could not check robots.txt: %s", e)
 
-        print(f"Scraping: {self.url} (crawl={crawl}, max_pages={self.max_pages}, max_depth={self.max_depth})", file=sys.stderr)
+        logger.info("Scraping: %s (crawl=%s, max_pages=%s, max_depth=%s)", self.url, crawl, self.max_pages, self.max_depth)
 
+        # Pages are checked out of a shared pool; the browser itself is only
+        # launched if some page can't be served over plain HTTP
+        pool = PagePool()
         try:
-            with sync_playwright() as p:
-                # Launch browser in headless mode (using Firefox for better macOS compatibility)
-                print("Launching browser...", file=sys.stderr)
-                browser = p.firefox.launch(
-                    headless=True
-                )
-
-                # Create context with realistic user agent
-                print("Creating browser context...", file=sys.stderr)
-                context = browser.new_context(
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    viewport={"width": 1920, "height": 1080}
-                )
-
-                page = context.new_page()
-
-                # Crawl the site using BFS
-                # Queue contains tuples of (url, depth)
-                to_crawl = deque([(self.url, 0)])
-                all_texts = []  # Collect text from all pages for analysis
-
-                while to_crawl and self.pages_crawled < self.max_pages:
-                    current_url, depth = to_crawl.popleft()
-
-                    if current_url in self.visited_urls:
-                        continue
-
-                    soup, text, links = self._crawl_page(page, current_url, depth)
-
-                    if soup and text:
-                        all_texts.append(text)
-
-                        # Extract basic data from the first (main) page
-                        if self.pages_crawled == 1:
-                            print("Extracting main page data...", file=sys.stderr)
-                            self._extract_name(soup, text)
-                            self._extract_description(soup, text)
-                            self._extract_contact_info(soup, text)
-                            self._extract_address(soup, text)
-                            self._extract_age_info(text)
-                            self._extract_hours_per_day(text)
-                            self._extract_pricing(text)
-                            self._extract_categories(text)
-
-                        # Always look for registration info on every page
-                        self._extract_registration_info(soup, text)
-
-                        # If crawling is enabled, add discovered links to queue
-                        if crawl and depth < self.max_depth:
-                            for link in links:
-                                if link not in self.visited_urls:
-                                    to_crawl.append((link, depth + 1))
-
-                    # Stop crawling if we found registration dates
-                    if self.data["re_enrollment_date"] and self.data["new_registration_date"]:
-                        print("Found all registration dates, stopping crawl.", file=sys.stderr)
-                        break
+            # Crawl the site breadth-first with a pool of page workers sharing one
+            # FIFO queue: a slow page only holds up its own worker instead of the
+            # whole depth level, and newly found links are picked up immediately
+            queue = asyncio.Queue()
+            queue.put_nowait((self.url, 0))
+            queued = {self.url}
+            all_texts = []  # Collect text from all pages for analysis
+
+            def found_all_dates() -> bool:
+                return bool(self.data["re_enrollment_date"] and self.data["new_registration_date"])
+
+            async def worker():
+                while True:
+                    url, depth = await queue.get()
+                    try:
+                        # Once both dates are known, drain the queue without fetching
+                        if found_all_dates() or self.pages_crawled >= self.max_pages:
+                            continue
 
-                # If we still don't have registration dates, try the registration URL directly
-                if self.data["registration_url"] and not self.data["re_enrollment_date"] and not self.data["new_registration_date"]:
-                    if self.data["registration_url"] not in self.visited_urls:
-                        print(f"Checking registration URL for dates: {self.data['registration_url']}", file=sys.stderr)
-                        self._scrape_registration_page(page)
+                        soup, text, links = await self._crawl_page(pool, url, depth)
 
-                # Close browser
-                print("Closing browser...", file=sys.stderr)
-                browser.close()
+                        if not (soup and text):
+                            continue
+                        # Alias URLs (tracking parameters, redirects) often serve the same page;
+                        # its text has nothing new to extract, but its links are still followed
+                        text_hash = hash(text)
+                        if text_hash in self._seen_text_hashes:
+                            logger.info("Skipping extraction for %s, same content as an earlier page", url)
+                        else:
+                            self._seen_text_hashes.add(text_hash)
+                            all_texts.append(text)
+                            # Keyword extractors share one lowered copy of the page
+                            text_lower = text.lower()
+
+                            # Extract basic data from the main page
+                            if depth == 0:
+                                logger.info("Extracting main page data...")
+                                jsonld = self._parse_jsonld(soup)
+                                self._extract_name(soup, text, jsonld)
+                                self._extract_description(soup, text, jsonld)
+                                self._extract_contact_info(soup, text)
+                                self._extract_address(soup, text, jsonld)
+                                self._extract_age_info(text)
+                                self._extract_hours_per_day(text)
+                                self._extract_pricing(text)
+                                self._extract_categories(text_lower)
+
+                            # Always look for registration info on every page
+                            self._extract_registration_info(soup, text_lower, url)
+
+                        # Stop crawling if we found registration dates
+                        if found_all_dates():
+                            logger.info("Found all registration dates, stopping crawl.")
+                            continue
 
-                print(f"Crawled {self.pages_crawled} pages total.", file=sys.stderr)
+                        # If crawling is enabled, queue discovered links one level deeper
+                        if crawl and depth < self.max_depth:
+                            for link in links:
+                                if link not in queued and link not in self.visited_urls:
+                                    queued.add(link)
+                                    queue.put_nowait((link, depth + 1))
+                    finally:
+                        queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(MAX_PARALLEL_PAGES)]
+            drained = asyncio.create_task(queue.join())
+            try:
+                # Workers only finish by raising; surface the first error instead of
+                # waiting on a queue that nobody is draining any more
+                await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+                for task in workers:
+                    if task.done():
+                        task.result()
+            finally:
+                for task in (drained, *workers):
+                    task.cancel()
+                await asyncio.gather(drained, *workers, return_exceptions=True)
+
+            # If we still don't have registration dates, try the registration URL directly
+            if self.data["registration_url"] and not self.data["re_enrollment_date"] and not self.data["new_registration_date"]:
+                if self.data["registration_url"] not in self.visited_urls:
+                    logger.info("Checking registration URL for dates: %s", self.data['registration_url'])
+                    async with pool.page() as page:
+                        await self._scrape_registration_page(page)
+
+            logger.info("Crawled %s pages total.", self.pages_crawled)
 
         except PlaywrightTimeout as e:
             raise Exception(f"Page load timeout: {str(e)}")
         except Exception as e:
             raise Exception(f"Scraping failed: {str(e)}")
+        finally:
+            await pool.close()
 
-        print("Scraping completed successfully!", file=sys.stderr)
+        logger.info("Scraping completed successfully!")
         return self.data
 
-    def _extract_name(self, soup: BeautifulSoup, text: str):
+    def _parse_jsonld(self, soup: BeautifulSoup) -> list:
+        """Parse a page's JSON-LD scripts once into a flat list of objects, with @graph entries expanded"""
+        items = []
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                # orjson only accepts exact str/bytes, not bs4's NavigableString subclass
+                data = orjson.loads(script.string.encode() if script.string else b'{}')
+            except orjson.JSONDecodeError:
+                continue
+            pending = data if isinstance(data, list) else [data]
+            while pending:
+                item = pending.pop(0)
+                if not isinstance(item, dict):
+                    continue
+                items.append(item)
+                if isinstance(item.get('@graph'), list):
+                    pending.extend(item['@graph'])
+        return items
+
+    def _jsonld_text(self, jsonld: list, key: str):
+        """First non-empty string value of key on a JSON-LD object describing the program, if any"""
+        for item in jsonld:
+            types = item.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if any(t in _JSONLD_PAGE_TYPES for t in types):
+                continue
+            value = item.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+        return None
+
+    def _extract_name(self, soup: BeautifulSoup, text: str, jsonld: list = ()):
         """Extract program/organization name"""
+        # Structured data names the organization directly
+        name = self._jsonld_text(jsonld, 'name')
+        if name:
+            self.data["name"] = name
+            return
+
         # Try meta tags first
         og_title = soup.find("meta", property="og:title")
         if og_title and og_title.get("content"):
@@ -311,7 +975,7 @@ class ProgramScraper:
         if title:
             # Clean up common suffixes
             name = title.text.strip()
-            name = re.sub(r'\s*[\|\-]\s*(Home|Welcome|About).*$', '', name, flags=re.IGNORECASE)
+            name = _TITLE_SUFFIX_RE.sub('', name)
             self.data["name"] = name.strip()
             return
 
@@ -325,39 +989,12 @@ class ProgramScraper:
         if not desc:
             return desc
 
-        # Patterns to remove (case insensitive)
-        boilerplate_patterns = [
-            # Cookie consent
-            r'by using this (website|site),?\s+you agree to\s+.*?cookies.*?\.?',
-            r'we use cookies\s+.*?\.?',
-            r'this (website|site) uses cookies\s+.*?\.?',
-            r'cookies?\s+help us\s+.*?\.?',
-            r'accept\s+(all\s+)?cookies?',
-            r'cookie\s+(policy|preferences|settings|consent)',
-            # Privacy/Terms
-            r'by (using|continuing|browsing)\s+.*?(agree|accept|consent)\s+.*?(terms|privacy|policy).*?\.?',
-            r'read our privacy policy',
-            r'view our terms',
-            # Generic website notices
-            r'javascript (is|must be) enabled',
-            r'please enable javascript',
-            r'your browser.*?not supported',
-            r'subscribe to our newsletter',
-            r'sign up for (our )?(newsletter|updates|emails)',
-            r'enter your email',
-            # Navigation/UI text
-            r'skip to (main )?content',
-            r'toggle navigation',
-            r'menu',
-            r'search\s*$',
-        ]
-
         cleaned = desc
-        for pattern in boilerplate_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in _BOILERPLATE_RES:
+            cleaned = pattern.sub('', cleaned)
 
         # Clean up extra whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
 
         # If we removed too much, return empty (will trigger fallback)
         if len(cleaned) < 30:
@@ -365,8 +1002,14 @@ class ProgramScraper:
 
         return cleaned
 
-    def _extract_description(self, soup: BeautifulSoup, text: str):
+    def _extract_description(self, soup: BeautifulSoup, text: str, jsonld: list = ()):
         """Extract program description"""
+        # Try structured data
+        cleaned = self._clean_description(self._jsonld_text(jsonld, 'description'))
+        if cleaned:
+            self.data["description"] = cleaned[:500]
+            return
+
         # Try meta description
         meta_desc = soup.find("meta", attrs={"name": "description"})
         if meta_desc and meta_desc.get("content"):
@@ -384,9 +1027,8 @@ class ProgramScraper:
                 return
 
         # Look for common about/description sections
-        about_keywords = ["about", "description", "overview", "our program", "what we offer"]
-        for keyword in about_keywords:
-            sections = soup.find_all(["p", "div"], class_=re.compile(keyword, re.IGNORECASE))
+        for keyword_re in _ABOUT_CLASS_RES:
+            sections = soup.find_all(["p", "div"], class_=keyword_re)
             if sections:
                 desc = " ".join([s.text.strip() for s in sections[:2]])
                 cleaned = self._clean_description(desc)
@@ -403,25 +1045,25 @@ class ProgramScraper:
 
     def _extract_contact_info(self, soup: BeautifulSoup, text: str):
         """Extract email and phone"""
-        # Email regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            # Filter out common non-contact emails
-            filtered = [e for e in emails if not any(x in e.lower() for x in ['noreply', 'example', 'test'])]
-            if filtered:
-                self.data["contact_email"] = filtered[0]
-
-        # Phone regex (US format)
-        phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            self.data["contact_phone"] = phones[0]
-
-    def _extract_address(self, soup, text: str):
+        email = phone = None
+        for match in _CONTACT_RE.finditer(text):
+            if match.lastgroup == "email":
+                if email is None and not any(x in match.group().lower() for x in _NON_CONTACT_EMAIL_MARKERS):
+                    email = match.group()
+            elif phone is None:
+                phone = match.group()
+            if email and phone:
+                break
+
+        if email:
+            self.data["contact_email"] = email
+        if phone:
+            self.data["contact_phone"] = phone
+
+    def _extract_address(self, soup, text: str, jsonld: list = ()):
         """Extract address and neighborhood from structured data and text"""
         # 1. Try structured data (schema.org, microdata, JSON-LD)
-        address = self._extract_structured_address(soup)
+        address = self._extract_structured_address(jsonld)
         if address:
             self.data["address"] = address
             self._infer_neighborhood(address)
@@ -436,60 +1078,49 @@ class ProgramScraper:
 
         # 3. Try broad US address regex patterns on page text
         # Full address with city, state
-        full_pattern = r'\d+\s+[A-Za-z\s\.]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way|Court|Ct|Circle|Cir|Place|Pl|Terrace|Ter|Parkway|Pkwy)[.,]?\s*(?:#\s*\w+|Suite\s*\w+|Ste\s*\w+|Unit\s*\w+)?[.,]?\s*[A-Za-z\s]+,?\s*[A-Z]{2}\s*\d{5}'
-        addresses = re.findall(full_pattern, text)
-        if addresses:
-            self.data["address"] = addresses[0].strip()
-            self._infer_neighborhood(addresses[0])
+        address = _FULL_ADDR_RE.search(text)
+        if address:
+            self.data["address"] = address.group().strip()
+            self._infer_neighborhood(address.group())
             return
 
         # Street address with city/state (no zip)
-        city_state_pattern = r'\d+\s+[A-Za-z\s\.]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way|Court|Ct|Circle|Cir|Place|Pl)[.,]?\s*(?:' + re.escape(self.region_city) + r')[.,]?\s*(?:CA|California|NY|New York|TX|Texas|IL|Illinois|WA|Washington)?'
-        addresses = re.findall(city_state_pattern, text, re.IGNORECASE)
-        if addresses:
-            self.data["address"] = addresses[0].strip()
-            self._infer_neighborhood(addresses[0])
+        address = self._city_addr_re.search(text)
+        if address:
+            self.data["address"] = address.group().strip()
+            self._infer_neighborhood(address.group())
             return
 
         # Fallback: just a street address (number + street name + suffix)
-        street_only = r'\d+\s+[A-Za-z\s\.]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way|Court|Ct)'
-        streets = re.findall(street_only, text)
-        if streets:
-            self.data["address"] = streets[0].strip()
-            self._infer_neighborhood(streets[0])
+        street = _STREET_ONLY_RE.search(text)
+        if street:
+            self.data["address"] = street.group().strip()
+            self._infer_neighborhood(street.group())
             return
 
         # No address found
         self.data["address"] = ""
         self.data["neighborhood"] = ""
 
-    def _extract_structured_address(self, soup):
+    def _extract_structured_address(self, jsonld: list):
         """Extract address from structured data (JSON-LD, microdata, etc.)"""
         # JSON-LD (schema.org)
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                import json
-                data = json.loads(script.string or '{}')
-                # Handle single object or array
-                items = data if isinstance(data, list) else [data]
-                for item in items:
-                    addr = item.get('address', {})
-                    if isinstance(addr, dict):
-                        parts = []
-                        if addr.get('streetAddress'):
-                            parts.append(addr['streetAddress'])
-                        if addr.get('addressLocality'):
-                            parts.append(addr['addressLocality'])
-                        if addr.get('addressRegion'):
-                            parts.append(addr['addressRegion'])
-                        if addr.get('postalCode'):
-                            parts.append(addr['postalCode'])
-                        if parts:
-                            return ', '.join(parts)
-                    elif isinstance(addr, str) and len(addr) > 5:
-                        return addr
-            except (json.JSONDecodeError, AttributeError):
-                continue
+        for item in jsonld:
+            addr = item.get('address', {})
+            if isinstance(addr, dict):
+                parts = []
+                if addr.get('streetAddress'):
+                    parts.append(addr['streetAddress'])
+                if addr.get('addressLocality'):
+                    parts.append(addr['addressLocality'])
+                if addr.get('addressRegion'):
+                    parts.append(addr['addressRegion'])
+                if addr.get('postalCode'):
+                    parts.append(addr['postalCode'])
+                if parts:
+                    return ', '.join(parts)
+            elif isinstance(addr, str) and len(addr) > 5:
+                return addr
         return None
 
     def _extract_html_address(self, soup):
@@ -526,25 +1157,10 @@ class ProgramScraper:
 
     def _infer_neighborhood(self, address: str):
         """Infer SF neighborhood from address"""
-        # Common SF neighborhoods and their street patterns
-        neighborhoods = {
-            "Marina District": ["marina", "chestnut", "lombard"],
-            "Mission District": ["mission", "valencia", "24th", "16th"],
-            "SOMA": ["townsend", "folsom", "howard", "2nd", "3rd"],
-            "Richmond District": ["geary", "clement"],
-            "Sunset District": ["judah", "noriega", "taraval"],
-            "Noe Valley": ["24th", "castro", "noe"],
-            "Castro": ["castro", "market", "18th"],
-            "Pacific Heights": ["pacific", "broadway", "fillmore"],
-            "Haight-Ashbury": ["haight", "ashbury"],
-            "North Beach": ["columbus", "broadway", "grant"],
-        }
-
-        address_lower = address.lower()
-        for neighborhood, keywords in neighborhoods.items():
-            if any(keyword in address_lower for keyword in keywords):
-                self.data["neighborhood"] = neighborhood
-                return
+        hits = [_KEYWORD_NEIGHBORHOOD[match.group(1).lower()] for match in _NEIGHBORHOOD_RE.finditer(address)]
+        if hits:
+            self.data["neighborhood"] = min(hits)[1]
+            return
 
         self.data["neighborhood"] = self.region_city
 
@@ -552,29 +1168,12 @@ class ProgramScraper:
         """Extract age range information"""
     def _extract_hours_per_day(self, text: str):
         """Extract operating hours per day"""
-        # Look for hours patterns (e.g., "Mon-Fri 9am-5pm")
-        hours_patterns = [
-            r'(?:hours?|open)[:\s]+([^\n]{10,80})',
-            r'((?:monday|mon)[-\s]*(?:friday|fri)[,\s]*\d+\s*(?:am|pm)[^\n]{0,40})',
-            r'((?:mon|tue|wed|thu|fri|sat|sun)[-\s/]+(?:mon|tue|wed|thu|fri|sat|sun)[,\s]+\d+[:\s]*\d*\s*(?:am|pm)[^\n]{0,40})',
-        ]
-
-        days_map = {
-            'monday': 'monday', 'mon': 'monday',
-            'tuesday': 'tuesday', 'tue': 'tuesday', 'tues': 'tuesday',
-            'wednesday': 'wednesday', 'wed': 'wednesday',
-            'thursday': 'thursday', 'thu': 'thursday', 'thurs': 'thursday',
-            'friday': 'friday', 'fri': 'friday',
-            'saturday': 'saturday', 'sat': 'saturday',
-            'sunday': 'sunday', 'sun': 'sunday',
-        }
-
         # Try to find hours text
         hours_text = None
-        for pattern in hours_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                hours_text = matches[0] if isinstance(matches[0], str) else matches[0][0]
+        for pattern in _HOURS_RES:
+            match = pattern.search(text)
+            if match:
+                hours_text = match.group(1)
                 break
 
         if hours_text:
@@ -590,20 +1189,19 @@ class ProgramScraper:
                 operating_days.extend(['saturday', 'sunday'])
 
             # Check for individual days
-            for abbr, full_day in days_map.items():
-                if re.search(r'\b' + abbr + r'\b', hours_lower):
+            for day_re, full_day in _DAY_RES:
+                if day_re.search(hours_lower):
                     if full_day not in operating_days:
                         operating_days.append(full_day)
 
             self.data["operating_days"] = operating_days
 
             # Extract time range (e.g., "9am-5pm" or "09:00-17:00")
-            time_pattern = r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*[-to–]+\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?'
-            time_matches = re.findall(time_pattern, hours_lower, re.IGNORECASE)
+            time_match = _TIME_RE.search(hours_lower)
 
-            if time_matches and operating_days:
+            if time_match and operating_days:
                 # Convert to 24-hour format
-                open_hour, open_min, open_period, close_hour, close_min, close_period = time_matches[0]
+                open_hour, open_min, open_period, close_hour, close_min, close_period = time_match.groups()
 
                 open_hour = int(open_hour)
                 close_hour = int(close_hour)
@@ -649,66 +1247,51 @@ class ProgramScraper:
     def _extract_pricing(self, text: str):
         """Extract pricing information with support for price ranges"""
         # Look for free programs
-        if re.search(r'\bfree\b', text, re.IGNORECASE):
+        if _FREE_RE.search(text):
             self.data["price_min"] = 0
             self.data["price_max"] = 0
             self.data["price_description"] = "Free"
             return
 
         # Look for price ranges: "$100-$200" or "$100 to $200"
-        range_pattern = r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*[-to–]+\s*\$?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:per|/|each)?\s*(month|session|class|week|term|semester|year)?'
-        range_matches = re.findall(range_pattern, text, re.IGNORECASE)
+        range_match = _PRICE_RANGE_RE.search(text)
 
-        if range_matches:
-            min_price = float(range_matches[0][0].replace(',', ''))
-            max_price = float(range_matches[0][1].replace(',', ''))
+        if range_match:
+            low, high, unit = range_match.groups()
+            min_price = float(low.replace(',', ''))
+            max_price = float(high.replace(',', ''))
             self.data["price_min"] = min_price
             self.data["price_max"] = max_price
 
-            if range_matches[0][2]:
-                unit = range_matches[0][2].lower()
+            if unit:
+                unit = unit.lower()
                 self.data["price_unit"] = f"per {unit}"
 
             return
 
         # Look for single dollar amounts
-        price_pattern = r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:per|/|each)?\s*(month|session|class|week|term|semester|year)?'
-        matches = re.findall(price_pattern, text, re.IGNORECASE)
+        match = _PRICE_RE.search(text)
 
-        if matches:
-            price_str = matches[0][0].replace(',', '')
-            price = float(price_str)
+        if match:
+            amount, unit = match.groups()
+            price = float(amount.replace(',', ''))
 
             # Set both min and max to same value for single price
             self.data["price_min"] = price
             self.data["price_max"] = price
 
-            if matches[0][1]:
-                unit = matches[0][1].lower()
+            if unit:
+                unit = unit.lower()
                 self.data["price_unit"] = f"per {unit}"
 
-    def _extract_categories(self, text: str):
+    def _extract_categories(self, text_lower: str):
         """Infer program categories from content"""
-        category_keywords = {
-            "swimming": ["swim", "aquatic", "water", "pool"],
-            "art": ["art", "painting", "drawing", "sculpture", "creative"],
-            "chess": ["chess"],
-            "soccer": ["soccer", "football"],
-            "music": ["music", "piano", "guitar", "violin", "instrument"],
-            "dance": ["dance", "ballet", "hip hop"],
-            "martial-arts": ["martial arts", "karate", "taekwondo", "judo", "kung fu"],
-            "technology": ["coding", "programming", "computer", "robotics", "tech"],
-            "academic": ["tutoring", "math", "science", "reading", "academic"],
-            "science": ["science", "stem", "engineering", "physics", "chemistry"],
-            "sports": ["sports", "athletic", "fitness"],
-        }
-
-        text_lower = text.lower()
-        categories = []
-
-        for category, keywords in category_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                categories.append(category)
+        found = set()
+        for match in _CATEGORY_RE.finditer(text_lower):
+            found.update(_KEYWORD_CATEGORIES[match.group(1)])
+            if len(found) == len(_CATEGORY_KEYWORDS):
+                break
+        categories = [category for category in _CATEGORY_KEYWORDS if category in found]
 
         # Ensure at least one category
         if not categories:
@@ -716,297 +1299,114 @@ class ProgramScraper:
 
         self.data["category"] = categories[:3]  # Limit to 3 categories
 
-    def _extract_registration_info(self, soup: BeautifulSoup, text: str):
+    def _extract_registration_info(self, soup: BeautifulSoup, text_lower: str, page_url: str):
         """Extract registration URL and registration dates (re-enrollment and new registration)"""
-        from datetime import datetime
-
-        # Extract registration URL from links
-        registration_keywords = ['register', 'enroll', 'sign-up', 'signup', 'sign up']
-
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '').lower()
-            link_text = link.get_text().lower()
-
-            # Skip mailto and tel links
-            if href.startswith('mailto:') or href.startswith('tel:'):
-                continue
-
-            # Check if link URL or text contains registration keywords
-            if any(kw in href or kw in link_text for kw in registration_keywords):
-                url = link.get('href')
-                # Make relative URLs absolute
-                if url.startswith('/'):
-                    parsed = urlparse(self.url)
-                    url = f"{parsed.scheme}://{parsed.netloc}{url}"
-                elif not url.startswith('http'):
-                    # Skip non-http protocols
-                    if ':' in url:
-                        continue
-                    url = f"{self.url.rstrip('/')}/{url}"
+        # Extract registration URL from links, keeping the first one found across pages
+        if not self.data["registration_url"]:
+            links = soup.find_all('a', href=True)
+            # Check every link's URL for registration keywords before any link text:
+            # hrefs are plain attribute reads, text needs a walk of each anchor's subtree
+            # unless the anchor holds a single string
+            href_matches = (link for link in links if _SIGNUP_LINK_RE.search(link['href']))
+            text_matches = (link for link in links
+                            if _SIGNUP_LINK_RE.search(link.string or link.get_text()))
+
+            for link in chain(href_matches, text_matches):
+                # Resolve relative, query-only and ../ hrefs against the page they came from
+                url = urljoin(page_url, link['href'].strip())
+                # Skip mailto, tel, javascript and other non-http protocols
+                if urlparse(url).scheme not in ('http', 'https'):
+                    continue
 
                 self.data["registration_url"] = url
                 break
 
-        # Extract registration dates
-        text_lower = text.lower()
+        # Extract registration dates, skipping the scan once both are known
+        missing = [field for field in ("re_enrollment_date", "new_registration_date")
+                   if not self.data[field]]
+        if not missing:
+            return
 
-        # Month names for parsing
-        months = {
-            'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
-            'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-        }
+        if not _DATE_PREFILTER.search(text_lower):
+            return
 
         today = datetime.now()
-        current_year = today.year
-
-        # Date patterns
-        date_patterns = [
-            # Monday, January 15, 2025 or Monday, Jan 15th 2025 (with day name)
-            r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday),?\s*(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s*(\d{4})',
-            # January 15, 2025 or Jan 15, 2025
-            r'(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s*(\d{4})',
-            # 01/15/2025 or 1/15/2025
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-            # 2025-01-15
-            r'(\d{4})-(\d{2})-(\d{2})',
-            # Monday, January 15 or Monday, Jan 15th (with day name, without year)
-            r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday),?\s*(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?(?!\s*,?\s*\d{4})',
-            # January 15 or Jan 15 (without year)
-            r'(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?(?!\s*,?\s*\d{4})',
-        ]
-
-        # Keywords for re-enrollment (current students)
-        re_enrollment_keywords = [
-            're-enrollment', 'reenrollment', 're enrollment',
-            'current students', 'returning students', 'current families',
-            'priority registration', 'early registration'
-        ]
-
-        # Keywords for new registration (new students)
-        new_registration_keywords = [
-            'open enrollment', 'new enrollment', 'new students', 'new families',
-            'general registration', 'public registration', 'returning students begins',
-            'registration opens', 'registration begins', 'enrollment opens',
-            'enrollment begins', 'sign up', 'register by', 'enroll by'
-        ]
-
-        def parse_date_from_context(context):
-            """Parse a date from context text, return datetime or None"""
-            for pattern in date_patterns:
-                matches = re.findall(pattern, context, re.IGNORECASE)
-                if not matches:
-                    continue
-
-                match = matches[0]
-
-                try:
-                    if len(match) == 3:
-                        if match[0].isdigit() and len(match[0]) == 4:
-                            # YYYY-MM-DD format
-                            year, month, day = int(match[0]), int(match[1]), int(match[2])
-                        elif match[2].isdigit() and len(match[2]) == 4:
-                            if match[0].isdigit():
-                                # MM/DD/YYYY format
-                                month, day, year = int(match[0]), int(match[1]), int(match[2])
-                            else:
-                                # Month DD, YYYY format
-                                month = months.get(match[0].lower(), 0)
-                                day = int(match[1])
-                                year = int(match[2])
-                        else:
-                            continue
-                    elif len(match) == 2:
-                        # Month DD format (assume current or next year)
-                        month = months.get(match[0].lower(), 0)
-                        day = int(match[1])
-                        test_date = datetime(current_year, month, day)
-                        year = current_year if test_date >= today else current_year + 1
-                    else:
-                        continue
-
-                    if month == 0:
-                        continue
-
-                    parsed_date = datetime(year, month, day)
-
-                    # Only consider future dates
-                    if parsed_date >= today:
-                        return parsed_date
 
-                except (ValueError, TypeError):
+        # One scan fills whichever dates are missing. Per field, a hit inside the previous
+        # keyword of that field is skipped, as a separate per-list scan would.
+        keyword_end = dict.fromkeys(missing, 0)
+        for keyword in _REGISTRATION_DATE_KEYWORD_RE.finditer(text_lower):
+            for field in missing:
+                start = keyword.start(field)
+                if start == -1 or start < keyword_end[field] or self.data[field]:
                     continue
+                keyword_end[field] = keyword.end(field)
 
-            return None
-
-        # Search for re-enrollment date
-        for keyword in re_enrollment_keywords:
-            keyword_idx = text_lower.find(keyword)
-            if keyword_idx == -1:
-                continue
-
-            # Get context around the keyword (300 chars after)
-            context = text_lower[keyword_idx:keyword_idx + 300]
-            found_date = parse_date_from_context(context)
-
-            if found_date:
-                self.data["re_enrollment_date"] = found_date.strftime('%Y-%m-%d')
-                break
-
-        # Search for new registration date
-        for keyword in new_registration_keywords:
-            keyword_idx = text_lower.find(keyword)
-            if keyword_idx == -1:
-                continue
+                # Search the context after the keyword (300 chars)
+                found_date = _parse_date_from_context(text_lower, start, start + 300, today)
+                if found_date:
+                    self.data[field] = found_date.strftime('%Y-%m-%d')
 
-            # Get context around the keyword (300 chars after)
-            context = text_lower[keyword_idx:keyword_idx + 300]
-            found_date = parse_date_from_context(context)
-
-            if found_date:
-                self.data["new_registration_date"] = found_date.strftime('%Y-%m-%d')
+            if all(self.data[field] for field in missing):
                 break
 
-    def _scrape_registration_page(self, page):
+    async def _scrape_registration_page(self, page):
         """Visit the registration URL and look for registration dates"""
-        from datetime import datetime
-
         reg_url = self.data["registration_url"]
         if not reg_url:
             return
 
         try:
-            print(f"Navigating to registration page: {reg_url}", file=sys.stderr)
-            page.goto(reg_url, wait_until="domcontentloaded", timeout=15000)
-            self.human_delay(1, 2)
+            logger.info("Navigating to registration page: %s", reg_url)
+            async with self.host_limiter.slot(reg_url):
+                await page.goto(reg_url, wait_until="domcontentloaded", timeout=15000)
 
             try:
-                page.wait_for_load_state("networkidle", timeout=5000)
+                await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
             except PlaywrightTimeout:
-                print("Registration page network idle timeout (continuing)...", file=sys.stderr)
+                logger.info("Registration page network idle timeout (continuing)...")
 
-            # Get page content
-            reg_text = page.inner_text("body")
+            # Text comes from the same strained parse as crawled pages, which avoids
+            # the layout pass innerText forces in the browser
+            _, reg_text = self._parse_page(await page.content())
             text_lower = reg_text.lower()
+            if not _DATE_PREFILTER.search(text_lower):
+                return
 
             today = datetime.now()
-            current_year = today.year
-
-            # Month names for parsing
-            months = {
-                'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-                'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
-                'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
-                'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-            }
-
-            # Date patterns
-            date_patterns = [
-                r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday),?\s*(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s*(\d{4})',
-                r'(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s*(\d{4})',
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',
-                r'(\d{4})-(\d{2})-(\d{2})',
-                r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday),?\s*(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?(?!\s*,?\s*\d{4})',
-                r'(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})(?:st|nd|rd|th)?(?!\s*,?\s*\d{4})',
-            ]
-
-            def parse_date_from_context(context):
-                for pattern in date_patterns:
-                    matches = re.findall(pattern, context, re.IGNORECASE)
-                    if not matches:
-                        continue
-                    match = matches[0]
-                    try:
-                        if len(match) == 3:
-                            if match[0].isdigit() and len(match[0]) == 4:
-                                year, month, day = int(match[0]), int(match[1]), int(match[2])
-                            elif match[2].isdigit() and len(match[2]) == 4:
-                                if match[0].isdigit():
-                                    month, day, year = int(match[0]), int(match[1]), int(match[2])
-                                else:
-                                    month = months.get(match[0].lower(), 0)
-                                    day = int(match[1])
-                                    year = int(match[2])
-                            else:
-                                continue
-                        elif len(match) == 2:
-                            month = months.get(match[0].lower(), 0)
-                            day = int(match[1])
-                            test_date = datetime(current_year, month, day)
-                            year = current_year if test_date >= today else current_year + 1
-                        else:
-                            continue
-                        if month == 0:
-                            continue
-                        parsed_date = datetime(year, month, day)
-                        if parsed_date >= today:
-                            return parsed_date
-                    except (ValueError, TypeError):
-                        continue
-                return None
-
-            # Keywords for re-enrollment
-            re_enrollment_keywords = [
-                're-enrollment', 'reenrollment', 're enrollment',
-                'current students', 'returning students', 'current families',
-                'priority registration', 'early registration'
-            ]
-
-            # Keywords for new registration
-            new_registration_keywords = [
-                'open enrollment', 'new enrollment', 'new students', 'new families',
-                'general registration', 'public registration',
-                'registration opens', 'registration begins', 'enrollment opens',
-                'enrollment begins', 'sign up', 'register by', 'enroll by',
-                'deadline', 'opens on', 'begins on', 'starts on'
-            ]
 
             # Search for re-enrollment date
             if not self.data["re_enrollment_date"]:
-                for keyword in re_enrollment_keywords:
-                    keyword_idx = text_lower.find(keyword)
-                    if keyword_idx == -1:
-                        continue
-                    context = text_lower[keyword_idx:keyword_idx + 300]
-                    found_date = parse_date_from_context(context)
+                for keyword in _RE_ENROLLMENT_RE.finditer(text_lower):
+                    found_date = _parse_date_from_context(text_lower, keyword.start(), keyword.start() + 300, today)
                     if found_date:
                         self.data["re_enrollment_date"] = found_date.strftime('%Y-%m-%d')
-                        print(f"Found re-enrollment date on registration page: {self.data['re_enrollment_date']}", file=sys.stderr)
+                        logger.info("Found re-enrollment date on registration page: %s", self.data['re_enrollment_date'])
                         break
 
             # Search for new registration date
             if not self.data["new_registration_date"]:
-                for keyword in new_registration_keywords:
-                    keyword_idx = text_lower.find(keyword)
-                    if keyword_idx == -1:
-                        continue
-                    context = text_lower[keyword_idx:keyword_idx + 300]
-                    found_date = parse_date_from_context(context)
+                for keyword in _REGISTRATION_PAGE_NEW_RE.finditer(text_lower):
+                    found_date = _parse_date_from_context(text_lower, keyword.start(), keyword.start() + 300, today)
                     if found_date:
                         self.data["new_registration_date"] = found_date.strftime('%Y-%m-%d')
-                        print(f"Found new registration date on registration page: {self.data['new_registration_date']}", file=sys.stderr)
+                        logger.info("Found new registration date on registration page: %s", self.data['new_registration_date'])
                         break
 
             # If still no dates found, try to find any prominent date on the page
             if not self.data["new_registration_date"]:
                 # Look for dates near common registration-related text
-                general_keywords = ['registration', 'enrollment', 'deadline', 'opens', 'begins', 'start']
-                for keyword in general_keywords:
-                    keyword_idx = text_lower.find(keyword)
-                    if keyword_idx == -1:
-                        continue
+                for keyword in _GENERAL_REGISTRATION_RE.finditer(text_lower):
                     # Search around the keyword (100 chars before and 200 after)
-                    start = max(0, keyword_idx - 100)
-                    context = text_lower[start:keyword_idx + 200]
-                    found_date = parse_date_from_context(context)
+                    start = max(0, keyword.start() - 100)
+                    found_date = _parse_date_from_context(text_lower, start, keyword.start() + 200, today)
                     if found_date:
                         self.data["new_registration_date"] = found_date.strftime('%Y-%m-%d')
-                        print(f"Found registration date on registration page: {self.data['new_registration_date']}", file=sys.stderr)
+                        logger.info("Found registration date on registration page: %s", self.data['new_registration_date'])
                         break
 
         except Exception as e:
-            print(f"Error scraping registration page: {e}", file=sys.stderr)
+            logger.error("Error scraping registration page: %s", e)
 
 
 def main():
@@ -1040,6 +1440,14 @@ Examples:
 
     args = parser.parse_args()
 
+    # Progress goes to stderr so stdout stays a single JSON document for callers. Only
+    # the scraper's own logger is configured, so httpx's per-request lines stay quiet.
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    scraper_logger = logging.getLogger("scraper")
+    scraper_logger.addHandler(handler)
+    scraper_logger.setLevel(logging.INFO)
+
     try:
         scraper = ProgramScraper(
             url=args.url,
@@ -1048,7 +1456,9 @@ Examples:
             region_city=args.region
         )
         result = scraper.scrape(crawl=not args.no_crawl)
-        print(json.dumps(result, indent=2))
+        # Pretty-print only for humans; callers parsing stdout get compact JSON
+        option = orjson.OPT_INDENT_2 if sys.stdout.isatty() else 0
+        sys.stdout.buffer.write(orjson.dumps(result, option=option | orjson.OPT_APPEND_NEWLINE))
     except Exception as e:
         print(json.dumps({"error": str(e)}), file=sys.stderr)
         sys.exit(1)
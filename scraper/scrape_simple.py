@@ -9,12 +9,74 @@ import re
 import sys
 import ssl
 import requests
+import requests_cache
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.ssl_ import create_urllib3_context
 
+# On-disk HTTP cache; every hit is revalidated, so unchanged pages cost a 304
+# while newly posted dates are still picked up
+HTTP_CACHE_PATH = Path(__file__).resolve().parent / ".cache" / "simple_http.sqlite"
+HTTP_CACHE_TTL_SECONDS = 3600
+
+# Title suffixes stripped from page titles when used as the program name
+_TITLE_SUFFIX_RE = re.compile(r'\s*[\|\-]\s*(Home|Welcome|About).*$', re.IGNORECASE)
+# Contact details
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')  # US format
+# SF street addresses
+_SF_ADDR_RE = re.compile(
+    r'\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way),?\s*(?:San Francisco|SF),?\s*CA',
+    re.IGNORECASE,
+)
+# Day lists followed by a time (e.g., "Monday, Wednesday 4:00")
+_SCHEDULE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'((?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)[,\s/&]+)+\s*\d+:\d+',
+)]
+# Pricing: free programs and single dollar amounts
+_FREE_RE = re.compile(r'\bfree\b', re.IGNORECASE)
+_PRICE_RE = re.compile(r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:per|/|each)?\s*(month|session|class|week)?', re.IGNORECASE)
+# Common SF neighborhoods and their street patterns, in priority order
+_NEIGHBORHOOD_KEYWORDS = {
+    "Marina District": ["marina", "chestnut", "lombard"],
+    "Mission District": ["mission", "valencia", "24th", "16th"],
+    "SOMA": ["townsend", "folsom", "howard", "2nd", "3rd"],
+    "Richmond District": ["geary", "clement"],
+    "Sunset District": ["judah", "noriega", "taraval"],
+    "Noe Valley": ["24th", "castro", "noe"],
+    "Castro": ["castro", "market", "18th"],
+}
+# Street keyword -> (priority, neighborhood) of the first neighborhood listing it
+_KEYWORD_NEIGHBORHOOD = {}
+for _rank, (_neighborhood, _keywords) in enumerate(_NEIGHBORHOOD_KEYWORDS.items()):
+    for _keyword in _keywords:
+        _KEYWORD_NEIGHBORHOOD.setdefault(_keyword, (_rank, _neighborhood))
+_NEIGHBORHOOD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _KEYWORD_NEIGHBORHOOD)) + "))",
+    re.IGNORECASE,
+)
+# Program categories and the keywords that suggest them, in priority order
+_CATEGORY_KEYWORDS = {
+    "swimming": ["swim", "aquatic", "water", "pool"],
+    "art": ["art", "painting", "drawing"],
+    "music": ["music", "piano", "guitar"],
+    "sports": ["sports", "athletic"],
+    "technology": ["coding", "programming", "tech"],
+    "academic": ["tutoring", "academic"],
+}
+_KEYWORD_CATEGORY = {keyword: category
+                     for category, keywords in _CATEGORY_KEYWORDS.items() for keyword in keywords}
+# All category keywords in one scan; the lookahead reports overlapping hits too
+_CATEGORY_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_CATEGORY)) + "))")
+
+# Elements whose content is code or fallback markup rather than page text;
+# they are removed from the parsed tree, wherever they are nested, before get_text
+_NON_CONTENT_TAGS = ['script', 'style', 'noscript', 'svg', 'template', 'iframe']
+
 # Custom SSL context for LibreSSL compatibility
 class SSLContextAdapter(HTTPAdapter):
     def init_poolmanager(self, *args, **kwargs):
@@ -26,9 +88,11 @@ class SSLContextAdapter(HTTPAdapter):
 
 
 class SimpleProgramScraper:
-    def __init__(self, url: str):
+    def __init__(self, url: str, http_cache: bool = True):
         self.url = url
         self.domain = urlparse(url).netloc
+        self.http_cache = http_cache  # Serve repeat fetches from HTTP_CACHE_PATH
+        self._session = None
         self.data = {
             "name": "",
             "description": "",
@@ -43,12 +107,39 @@ class SimpleProgramScraper:
             "price_unit": None
         }
 
+    def _get_session(self) -> requests.Session:
+        """Return the scraper's HTTP session, creating it on first use"""
+        if self._session is None:
+            if self.http_cache:
+                try:
+                    HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                    self._session = requests_cache.CachedSession(
+                        str(HTTP_CACHE_PATH), backend='sqlite', expire_after=HTTP_CACHE_TTL_SECONDS,
+                        always_revalidate=True,
+                    )
+                except Exception as e:
+                    # Read-only or serverless filesystems still scrape, just uncached
+                    print(f"Warning: HTTP cache unavailable, fetching without it: {e}", file=sys.stderr)
+            if self._session is None:
+                self._session = requests.Session()
+            # SSL adapter for LibreSSL compatibility
+            self._session.mount('https://', SSLContextAdapter())
+        return self._session
+
     def check_robots_txt(self) -> bool:
         """Check if scraping is allowed by robots.txt"""
         try:
             rp = RobotFileParser()
             rp.set_url(f"https://{self.domain}/robots.txt")
-            rp.read()
+            # Fetched through the (cached) session rather than urllib
+            response = self._get_session().get(rp.url, timeout=30)
+            if response.status_code in (401, 403):
+                rp.disallow_all = True
+            elif 400 <= response.status_code < 500:
+                rp.allow_all = True
+            else:
+                response.raise_for_status()
+                rp.parse(response.text.splitlines())
             return rp.can_fetch("*", self.url)
         except Exception as e:
             print(f"Warning: Could not check robots.txt: {e}", file=sys.stderr)
@@ -56,35 +147,40 @@ class SimpleProgramScraper:
 
     def scrape(self) -> dict:
         """Main scraping method"""
-        # Check robots.txt
-        try:
-            if not self.check_robots_txt():
-                print(f"Warning: robots.txt disallows scraping {self.url}", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: robots.txt check failed: {e}", file=sys.stderr)
+        # Fetch page with realistic headers
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+        }
+        session = self._get_session()
 
         print(f"Scraping: {self.url}", file=sys.stderr)
+        print("Fetching page...", file=sys.stderr)
 
-        try:
-            # Fetch page with realistic headers
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-            }
-
-            print("Fetching page...", file=sys.stderr)
+        # robots.txt only ever produces a warning, so it is checked on this thread
+        # while the page downloads on another, sharing the session's connection pool
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page_request = executor.submit(session.get, self.url, headers=headers, timeout=30)
 
-            # Create session with SSL adapter for LibreSSL compatibility
-            session = requests.Session()
-            session.mount('https://', SSLContextAdapter())
+            # Check robots.txt
+            try:
+                if not self.check_robots_txt():
+                    print(f"Warning: robots.txt disallows scraping {self.url}", file=sys.stderr)
+            except Exception as e:
+                print(f"Warning: robots.txt check failed: {e}", file=sys.stderr)
 
-            response = session.get(self.url, headers=headers, timeout=30)
+        try:
+            response = page_request.result()
             response.raise_for_status()
 
             # Parse HTML
             print("Parsing HTML...", file=sys.stderr)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # lxml is a C parser; raw bytes let it pick up the page's declared encoding
+            soup = BeautifulSoup(response.content, 'lxml')
+            # Script and style bodies would otherwise show up in the text extractors read
+            for tag in soup(_NON_CONTENT_TAGS):
+                tag.decompose()
             text = soup.get_text(separator=' ', strip=True)
 
             # Extract data
@@ -117,7 +213,7 @@ class SimpleProgramScraper:
         title = soup.find("title")
         if title:
             name = title.text.strip()
-            name = re.sub(r'\s*[\|\-]\s*(Home|Welcome|About).*$', '', name, flags=re.IGNORECASE)
+            name = _TITLE_SUFFIX_RE.sub('', name)
             self.data["name"] = name.strip()
             return
 
@@ -149,97 +245,66 @@ class SimpleProgramScraper:
     def _extract_contact_info(self, soup: BeautifulSoup, text: str):
         """Extract email and phone"""
         # Email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = _EMAIL_RE.findall(text)
         if emails:
             filtered = [e for e in emails if not any(x in e.lower() for x in ['noreply', 'example', 'test'])]
             if filtered:
                 self.data["contact_email"] = filtered[0]
 
         # Phone (US format)
-        phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            self.data["contact_phone"] = phones[0]
+        phone = _PHONE_RE.search(text)
+        if phone:
+            self.data["contact_phone"] = phone.group()
 
     def _extract_address(self, text: str):
         """Extract address and neighborhood"""
         # SF addresses
-        sf_pattern = r'\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Road|Rd|Drive|Dr|Lane|Ln|Way),?\s*(?:San Francisco|SF),?\s*CA'
-        addresses = re.findall(sf_pattern, text, re.IGNORECASE)
-        if addresses:
-            self.data["address"] = addresses[0]
-            self._infer_neighborhood(addresses[0])
+        address = _SF_ADDR_RE.search(text)
+        if address:
+            self.data["address"] = address.group()
+            self._infer_neighborhood(address.group())
         else:
             self.data["address"] = "San Francisco, CA"
             self.data["neighborhood"] = "San Francisco"
 
     def _infer_neighborhood(self, address: str):
         """Infer SF neighborhood from address"""
-        neighborhoods = {
-            "Marina District": ["marina", "chestnut", "lombard"],
-            "Mission District": ["mission", "valencia", "24th", "16th"],
-            "SOMA": ["townsend", "folsom", "howard", "2nd", "3rd"],
-            "Richmond District": ["geary", "clement"],
-            "Sunset District": ["judah", "noriega", "taraval"],
-            "Noe Valley": ["24th", "castro", "noe"],
-            "Castro": ["castro", "market", "18th"],
-        }
-
-        address_lower = address.lower()
-        for neighborhood, keywords in neighborhoods.items():
-            if any(keyword in address_lower for keyword in keywords):
-                self.data["neighborhood"] = neighborhood
-                return
+        hits = [_KEYWORD_NEIGHBORHOOD[match.group(1).lower()] for match in _NEIGHBORHOOD_RE.finditer(address)]
+        if hits:
+            self.data["neighborhood"] = min(hits)[1]
+            return
         self.data["neighborhood"] = "San Francisco"
 
     def _extract_schedule(self, text: str):
         """Extract schedule"""
-        schedule_patterns = [
-            r'((?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)[,\s/&]+)+\s*\d+:\d+',
-        ]
-
-        for pattern in schedule_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                self.data["schedule"] = matches[0][:200]
+        for pattern in _SCHEDULE_RES:
+            match = pattern.search(text)
+            if match:
+                self.data["schedule"] = match.group(1)[:200]
                 return
         self.data["schedule"] = "Contact for schedule information"
 
     def _extract_pricing(self, text: str):
         """Extract pricing"""
-        if re.search(r'\bfree\b', text, re.IGNORECASE):
+        if _FREE_RE.search(text):
             self.data["price_type"] = "free"
             self.data["price"] = 0
             return
 
-        price_pattern = r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:per|/|each)?\s*(month|session|class|week)?'
-        matches = re.findall(price_pattern, text, re.IGNORECASE)
+        match = _PRICE_RE.search(text)
 
-        if matches:
-            price_str = matches[0][0].replace(',', '')
-            self.data["price"] = float(price_str)
-            if matches[0][1]:
-                unit = matches[0][1].lower()
+        if match:
+            amount, unit = match.groups()
+            self.data["price"] = float(amount.replace(',', ''))
+            if unit:
+                unit = unit.lower()
                 self.data["price_unit"] = f"per {unit}"
                 self.data["price_type"] = "recurring" if unit in ['month', 'week'] else "one-time"
 
     def _extract_categories(self, text: str):
         """Infer categories"""
-        category_keywords = {
-            "swimming": ["swim", "aquatic", "water", "pool"],
-            "art": ["art", "painting", "drawing"],
-            "music": ["music", "piano", "guitar"],
-            "sports": ["sports", "athletic"],
-            "technology": ["coding", "programming", "tech"],
-            "academic": ["tutoring", "academic"],
-        }
-
-        text_lower = text.lower()
-        categories = []
-        for category, keywords in category_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                categories.append(category)
+        found = {_KEYWORD_CATEGORY[match.group(1)] for match in _CATEGORY_RE.finditer(text.lower())}
+        categories = [category for category in _CATEGORY_KEYWORDS if category in found]
 
         self.data["category"] = categories[:3] if categories else ["creative"]
 
@@ -0,0 +1,29 @@
+-- Batch update of scraped registration info
+-- Lets the provider scraper apply many per-program updates in one round trip.
+-- Each element of `updates` is {"id": ..., "registration_url": ..., "re_enrollment_date": ..., "new_registration_date": ...};
+-- missing or null fields keep their current value.
+
+CREATE OR REPLACE FUNCTION bulk_update_program_registration(updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE programs p
+    SET registration_url = COALESCE(u.registration_url, p.registration_url),
+        re_enrollment_date = COALESCE(u.re_enrollment_date, p.re_enrollment_date),
+        new_registration_date = COALESCE(u.new_registration_date, p.new_registration_date)
+    FROM jsonb_to_recordset(updates) AS u(
+        id UUID,
+        registration_url TEXT,
+        re_enrollment_date DATE,
+        new_registration_date DATE
+    )
+    WHERE p.id = u.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the service role (used by the scraper) may call it
+REVOKE EXECUTE ON FUNCTION bulk_update_program_registration(JSONB) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,35 @@
+-- Scraper checkpoint
+-- Records when the provider scraper last visited each program so batch runs
+-- can start with the least recently scraped providers and resume after an
+-- interrupted run instead of rescanning from the beginning.
+
+ALTER TABLE programs ADD COLUMN IF NOT EXISTS last_scraped_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_programs_last_scraped_at ON programs(last_scraped_at NULLS FIRST, id);
+
+-- Same as before, plus the checkpoint column
+CREATE OR REPLACE FUNCTION bulk_update_program_registration(updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE programs p
+    SET registration_url = COALESCE(u.registration_url, p.registration_url),
+        re_enrollment_date = COALESCE(u.re_enrollment_date, p.re_enrollment_date),
+        new_registration_date = COALESCE(u.new_registration_date, p.new_registration_date),
+        last_scraped_at = COALESCE(u.last_scraped_at, p.last_scraped_at)
+    FROM jsonb_to_recordset(updates) AS u(
+        id UUID,
+        registration_url TEXT,
+        re_enrollment_date DATE,
+        new_registration_date DATE,
+        last_scraped_at TIMESTAMPTZ
+    )
+    WHERE p.id = u.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION bulk_update_program_registration(JSONB) FROM PUBLIC, anon, authenticated;